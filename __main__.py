@@ -4,13 +4,24 @@ from oppadc.osudifficulty import OsuDifficulty
 from oppadc.osustats import OsuStats
 from oppadc.osupp import OsuPP
 
+if len(sys.argv) > 1 and sys.argv[1] == "batch":
+	from oppadc.batch import main
+	sys.exit( main(sys.argv[2:]) )
+
+if len(sys.argv) > 1 and sys.argv[1] == "server":
+	from oppadc.server import main
+	sys.exit( main(sys.argv[2:]) )
+
 mods:int = 0
 acc_percent:float = 100.0
 combo:int = None
 misses:int = 0
+timings:bool = False
 
 for arg in sys.argv:
-	if arg.startswith("+"):
+	if arg == "--timings":
+		timings = True
+	elif arg.startswith("+"):
 		mods = OsuModIndex.getValueFromString(arg[1:])
 	elif arg.endswith("%"):
 		acc_percent = float(arg[:-1])
@@ -21,9 +32,9 @@ for arg in sys.argv:
 
 map_path_str:str = sys.argv[1]
 
-Map:OsuMap = OsuMap(file_path=map_path_str)
+Map:OsuMap = OsuMap(file_path=map_path_str, profile=timings)
 
-P:OsuPP = Map.getPP(Mods=mods, accuracy=acc_percent, combo=combo, misses=misses)
+P:OsuPP = Map.getPP(Mods=mods, accuracy=acc_percent, combo=combo, misses=misses, profile=timings)
 D:OsuDifficulty = Map.getDifficulty()
 S:OsuStats = Map.getStats()
 
@@ -40,5 +51,7 @@ print("--PP--")
 print(f"{round(P.total_pp,2)}PP (speed={round(P.speed_pp,2)} aim={round(P.aim_pp,2)} acc={round(P.acc_pp,2)})")
 print("#"*32)
 
-
-
+if timings:
+	print("--Timings--")
+	print(P.Timings)
+	print("#"*32)
@@ -0,0 +1,108 @@
+"""
+	deterministic synthetic .osu maps for the benchmarks,
+	the same ( kind, amount, seed ) always gives the same map
+
+	python benchmarks/generate.py stream 5000 > stream.osu
+"""
+import sys
+import random
+
+MAP_KINDS:tuple = ("stream", "jump", "slider", "spinner", "mixed")
+
+MAP_HEAD:str = """osu file format v14
+
+[General]
+AudioFilename: audio.mp3
+Mode: 0
+
+[Metadata]
+Title:{kind}
+TitleUnicode:{kind}
+Artist:oppadc benchmarks
+ArtistUnicode:oppadc benchmarks
+Creator:generate.py
+Version:{kind} {amount}
+Source:
+Tags:benchmark synthetic
+BeatmapID:0
+BeatmapSetID:0
+
+[Difficulty]
+HPDrainRate:5
+CircleSize:4
+OverallDifficulty:8
+ApproachRate:9
+SliderMultiplier:1.6
+SliderTickRate:1
+
+[Events]
+
+[TimingPoints]
+{timingpoints}
+
+[HitObjects]
+"""
+
+def generateMap(kind:str, amount:int, seed:int=727) -> str:
+	"""
+		returns the content of a .osu map with amount hit objects:
+			stream: 1/4 streams at 180 bpm with small spacing
+			jump: 1/2 jumps across the whole playfield
+			slider: mostly sliders with repeats
+			spinner: a spinner every few objects
+			mixed: a bit of everything, in sections
+	"""
+	if kind not in MAP_KINDS:
+		raise NotImplementedError(f"unknown map kind: {kind}")
+
+	Random:random.Random = random.Random(f"{kind}-{amount}-{seed}")
+	beat:float = 60000 / 180
+
+	timingpoints:list = [f"1000,{beat},4,2,1,60,1,0"]
+	# some slider velocity changes, so the timing point lookup has something to do
+	for i in range(1, 1 + amount // 500):
+		timingpoints.append(f"{1000 + i * 64 * beat},{Random.choice((-50, -75, -100, -133.33))},4,2,1,60,0,0")
+
+	lines:list = [ MAP_HEAD.format(kind=kind, amount=amount, timingpoints="\n".join(timingpoints)) ]
+
+	time:float = 1000.0
+	x:float = 256.0
+	y:float = 192.0
+	for i in range(amount):
+		current:str = kind
+		if kind == "mixed":
+			current = ("stream", "jump", "slider", "spinner")[ (i // 64) % 4 ]
+
+		if current == "spinner" and i % 8 == 7:
+			length:float = beat * Random.choice((2, 4, 8))
+			lines.append(f"256,192,{int(time)},12,0,{int(time + length)},0:0:0:0:")
+			time += length + beat
+			continue
+
+		if current == "stream":
+			x = min(512, max(0, x + Random.uniform(-30, 30)))
+			y = min(384, max(0, y + Random.uniform(-30, 30)))
+			step:float = beat / 4
+		elif current == "jump":
+			x, y = Random.uniform(0, 512), Random.uniform(0, 384)
+			step = beat / 2
+		else:
+			x = min(512, max(0, x + Random.uniform(-120, 120)))
+			y = min(384, max(0, y + Random.uniform(-90, 90)))
+			step = beat / 2
+
+		if current == "slider" and Random.random() < 0.8:
+			repetitions:int = Random.choice((1, 1, 2, 3))
+			length:float = Random.uniform(60, 240)
+			end_x:int = int(min(512, max(0, x + Random.uniform(-100, 100))))
+			end_y:int = int(min(384, max(0, y + Random.uniform(-100, 100))))
+			lines.append(f"{int(x)},{int(y)},{int(time)},2,0,B|{int((x + end_x) / 2)}:{int(y)}|{end_x}:{end_y},{repetitions},{round(length, 2)}")
+			time += beat * repetitions
+		else:
+			lines.append(f"{int(x)},{int(y)},{int(time)},1,0,0:0:0:0:")
+			time += step
+
+	return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+	sys.stdout.write( generateMap(sys.argv[1], int(sys.argv[2]), *(int(v) for v in sys.argv[3:4])) )
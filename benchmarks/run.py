@@ -0,0 +1,144 @@
+"""
+	times the parts of a calculation on synthetic maps (see generate.py)
+
+	python benchmarks/run.py                            # everything, JSON to stdout
+	python benchmarks/run.py --output baseline.json     # save a baseline
+	python benchmarks/run.py --compare baseline.json    # fails (exit code 1) on regressions
+	python benchmarks/run.py --engine numpy --compare baseline.json
+
+	every phase is repeated and the fastest run is taken,
+	all times are in seconds
+"""
+from typing import Callable
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oppadc
+from oppadc.osumap import OsuMap
+from oppadc.osustats import OsuStats, DIFF_SPEED, DIFF_AIM
+from oppadc.osupp import OsuPP
+from oppadc.vector import Vector
+from generate import generateMap
+
+CASES:tuple = (
+	("stream", 1000), ("stream", 5000),
+	("jump", 1000), ("jump", 5000),
+	("slider", 1000), ("slider", 5000),
+	("spinner", 1000),
+	("mixed", 20000),
+)
+QUICK_CASES:tuple = ( ("stream", 1000), ("jump", 1000), ("slider", 1000), ("spinner", 1000) )
+
+PHASES:tuple = ("parse", "max_combo", "calc_norm_pos", "calc_speed", "calc_aim", "stats_calc", "pp_calc")
+
+def fastest(work:Callable, repeat:int, setup:Callable=None) -> float:
+	"""
+		runs work() repeat times and returns the fastest time, setup() is called (untimed) before every run
+		and its result is given to work
+	"""
+	best:float = float("inf")
+	for _ in range(repeat):
+		value:object = setup() if setup else None
+
+		start:float = time.perf_counter()
+		work(value)
+		best = min(best, time.perf_counter() - start)
+
+	return best
+
+def benchCase(content:str, repeat:int, engine:str) -> dict:
+	"""
+		times every phase of PHASES on the map content
+	"""
+	results:dict = {}
+	results["parse"] = fastest(lambda _: OsuMap(raw_str=content), repeat)
+
+	Map:OsuMap = OsuMap(raw_str=content)
+	# the walk itself, Map.maxCombo() is only calculated once per map
+	results["max_combo"] = fastest(lambda _: sum(Map.objectCombos()), repeat)
+
+	Difficulty = Map.getDifficulty()
+	scaling_factor:float = OsuStats.scalingFactor(Difficulty.cs)
+	PlayfieldCenter:Vector = Vector(256, 256) * scaling_factor
+
+	def statsWithNormPos() -> OsuStats:
+		Stats:OsuStats = OsuStats(Map, Difficulty)
+		Stats.calcNormPos(PlayfieldCenter, scaling_factor)
+		return Stats
+
+	results["calc_norm_pos"] = fastest(lambda Stats: Stats.calcNormPos(PlayfieldCenter, scaling_factor), repeat, setup=lambda: OsuStats(Map, Difficulty))
+	results["calc_speed"] = fastest(lambda Stats: Stats.calcIndividual(Difficulty, DIFF_SPEED), repeat, setup=statsWithNormPos)
+	results["calc_aim"] = fastest(lambda Stats: Stats.calcIndividual(Difficulty, DIFF_AIM), repeat, setup=statsWithNormPos)
+	results["stats_calc"] = fastest(lambda Stats: Stats.calc(engine=engine), repeat, setup=lambda: OsuStats(Map, Difficulty))
+
+	Map.getStats(engine=engine)
+	results["pp_calc"] = fastest(lambda PP: PP.calc(accuracy=98.5, misses=1), repeat, setup=lambda: OsuPP(Map, Stats=Map.getStats(engine=engine)))
+
+	return results
+
+def compare(results:dict, baseline:dict, threshold:float) -> list:
+	"""
+		returns ( case, phase, baseline time, time, ratio ) of every phase
+		that is more than threshold (0.1 = 10%) slower than the baseline
+	"""
+	regressions:list = []
+	for case, phases in results["results"].items():
+		for phase, seconds in phases.items():
+			base:float = baseline.get("results", {}).get(case, {}).get(phase)
+			if not base: continue
+
+			ratio:float = seconds / base
+			if ratio > 1 + threshold:
+				regressions.append( (case, phase, base, seconds, ratio) )
+
+	return regressions
+
+def main(argv:list=None) -> int:
+	Parser:argparse.ArgumentParser = argparse.ArgumentParser(description="oppadc benchmarks")
+	Parser.add_argument("--repeat", type=int, default=5, help="runs per phase, the fastest counts (default: 5)")
+	Parser.add_argument("--engine", default="python", choices=("python", "numpy"), help="engine for stats_calc")
+	Parser.add_argument("--quick", action="store_true", help="only the small maps")
+	Parser.add_argument("--output", default="-", help="JSON result file (default: stdout)")
+	Parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+	Parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown against the baseline (default: 0.1 = 10%%)")
+	args:argparse.Namespace = Parser.parse_args(argv)
+
+	results:dict = dict(
+		oppadc=oppadc.__version__, python=platform.python_version(), machine=platform.machine(),
+		engine=args.engine, repeat=args.repeat, results={}
+	)
+
+	for kind, amount in (QUICK_CASES if args.quick else CASES):
+		case:str = f"{kind}-{amount}"
+		results["results"][case] = benchCase(generateMap(kind, amount), args.repeat, args.engine)
+
+		timings:str = " ".join( f"{phase}={round(seconds * 1000, 2)}ms" for phase, seconds in results["results"][case].items() )
+		print(f"{case}: {timings}", file=sys.stderr)
+
+	data:str = json.dumps(results, indent=2)
+	if args.output == "-":
+		print(data)
+	else:
+		with open(args.output, mode='w', encoding="UTF-8") as Output:
+			Output.write(data)
+
+	if not args.compare: return 0
+
+	with open(args.compare, mode='r', encoding="UTF-8") as Baseline:
+		regressions:list = compare(results, json.load(Baseline), args.threshold)
+
+	for case, phase, base, seconds, ratio in regressions:
+		print(f"REGRESSION {case} {phase}: {round(base * 1000, 2)}ms -> {round(seconds * 1000, 2)}ms (x{round(ratio, 2)})", file=sys.stderr)
+
+	print(f"{len(regressions)} regressions against {args.compare}", file=sys.stderr)
+	return 1 if regressions else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
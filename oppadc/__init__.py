@@ -8,3 +8,7 @@ __version__ = "1.1"
 
 from .osumap import OsuMap
 from .osumod import OsuModIndex
+from .osumapcache import OsuMapCache, load
+from .osuasync import aload
+from .osuarchive import iterOsz
+from .osudb import OsuDb
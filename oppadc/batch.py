@@ -0,0 +1,191 @@
+"""
+	calculates a lot of maps with a pool of processes
+
+	python -m oppadc.batch [options] inputs...
+	python __main__.py batch [options] inputs...
+
+	inputs can be .osu files, directories (searched recursively), glob patterns
+	or @file, a text file with one path per line.
+	results are written as JSON Lines or CSV while they come in,
+	a map that fails does not stop the batch, it gets a record with the error
+"""
+from typing import Iterator, TextIO
+
+import os
+import sys
+import csv
+import json
+import glob
+import time
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from .osumap import OsuMap
+from .osustats import OsuStats
+from .osupp import OsuPP, OsuPPMapValues
+
+RESULT_FIELDS:tuple = (
+	"path", "mods", "title", "artist", "version", "map_id", "mapset_id",
+	"stars", "aim", "speed", "max_combo", "accuracy",
+	"pp", "aim_pp", "speed_pp", "acc_pp", "error"
+)
+
+def findMaps(inputs:list) -> Iterator[str]:
+	"""
+		yields every .osu path found in inputs (files, directories, globs or @filelist)
+	"""
+	for source in inputs:
+		if source.startswith("@"):
+			with open(source[1:], mode='r', encoding="UTF-8") as FileList:
+				for line in FileList:
+					line = line.strip()
+					if line: yield line
+
+		elif os.path.isdir(source):
+			for root, _dirs, files in os.walk(source):
+				for name in sorted(files):
+					if name.endswith(".osu"):
+						yield os.path.join(root, name)
+
+		elif os.path.isfile(source):
+			yield source
+
+		else:
+			for path in sorted( glob.glob(source, recursive=True) ):
+				if os.path.isfile(path):
+					yield path
+
+def calcFile(file_path:str, mods_list:list, accuracy:float=100, engine:str="python") -> list:
+	"""
+		returns one result record (dict with RESULT_FIELDS) per mods in mods_list,
+		or a single record with the error if the map can't be calculated
+	"""
+	try:
+		Map:OsuMap = OsuMap(file_path=file_path)
+		max_combo:int = Map.maxCombo()
+		PP:OsuPP = OsuPP(Map)
+
+		results:list = []
+		for Stats in Map.getStatsMulti(mods_list, engine=engine):
+			Stats:OsuStats = Stats
+			Values:OsuPPMapValues = OsuPPMapValues(PP, Stats=Stats, Difficulty=Stats.Difficulty, max_combo=max_combo)
+			point:tuple = PP.calcPoint(Values, accuracy=accuracy)
+
+			results.append( dict(
+				path=file_path, mods=Stats.Difficulty.mods_str or "NM",
+				title=Map.title, artist=Map.artist, version=Map.version, map_id=Map.map_id, mapset_id=Map.mapset_id,
+				stars=Stats.total, aim=Stats.aim, speed=Stats.speed, max_combo=max_combo, accuracy=point[0],
+				pp=point[6], aim_pp=point[7], speed_pp=point[8], acc_pp=point[9], error=None
+			) )
+
+		return results
+
+	except Exception as e:
+		return [ dict(path=file_path, error=f"{e.__class__.__name__}: {e}") ]
+
+def calcChunk(paths:list, mods_list:list, accuracy:float=100, engine:str="python") -> list:
+	"""
+		calcFile() for every path, this is what a worker process runs
+	"""
+	return [ calcFile(path, mods_list, accuracy=accuracy, engine=engine) for path in paths ]
+
+def chunks(paths:Iterator[str], size:int) -> Iterator[list]:
+	chunk:list = []
+	for path in paths:
+		chunk.append(path)
+		if len(chunk) >= size:
+			yield chunk
+			chunk = []
+
+	if chunk:
+		yield chunk
+
+def runBatch(inputs:list, mods_list:list, Output:TextIO, output_format:str="jsonl", workers:int=None, chunksize:int=16, accuracy:float=100, engine:str="python") -> dict:
+	"""
+		calculates every map of inputs for every mods in mods_list and writes the results into Output,
+		workers=1 calculates everything in this process.
+		returns a summary dict
+	"""
+	if output_format not in ("jsonl", "csv"):
+		raise NotImplementedError(f"unknown output format: {output_format}")
+
+	Writer:csv.DictWriter = None
+	if output_format == "csv":
+		Writer = csv.DictWriter(Output, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+		Writer.writeheader()
+
+	summary:dict = dict(files=0, ok=0, failed=0, results=0, seconds=0.0)
+	start:float = time.perf_counter()
+
+	work = functools.partial(calcChunk, mods_list=mods_list, accuracy=accuracy, engine=engine)
+	path_chunks:Iterator[list] = chunks(findMaps(inputs), chunksize)
+
+	Executor:ProcessPoolExecutor = None
+	if workers == 1:
+		chunk_results:Iterator[list] = map(work, path_chunks)
+	else:
+		Executor = ProcessPoolExecutor(max_workers=workers)
+		chunk_results = Executor.map(work, path_chunks)
+
+	try:
+		for chunk_result in chunk_results:
+			for file_results in chunk_result:
+				summary["files"] += 1
+				if file_results[0].get("error"):
+					summary["failed"] += 1
+				else:
+					summary["ok"] += 1
+
+				for record in file_results:
+					summary["results"] += 1
+					if Writer:
+						Writer.writerow(record)
+					else:
+						Output.write(json.dumps(record) + "\n")
+
+			Output.flush()
+
+	finally:
+		if Executor:
+			Executor.shutdown()
+
+	summary["seconds"] = time.perf_counter() - start
+	return summary
+
+def main(argv:list=None) -> int:
+	Parser:argparse.ArgumentParser = argparse.ArgumentParser(prog="oppadc batch", description="calculate a lot of maps at once")
+	Parser.add_argument("inputs", nargs="+", help=".osu files, directories, glob patterns or @filelist")
+	Parser.add_argument("--mods", default="NM", help="comma separated mod combinations, e.g. NM,HD,HR,DT,HDHR (default: NM)")
+	Parser.add_argument("--format", dest="output_format", default="jsonl", choices=("jsonl", "csv"))
+	Parser.add_argument("--output", default="-", help="output file (default: stdout)")
+	Parser.add_argument("--workers", type=int, default=None, help="processes (default: cpu count, 1 = no pool)")
+	Parser.add_argument("--chunksize", type=int, default=16, help="maps per task (default: 16)")
+	Parser.add_argument("--accuracy", type=float, default=100.0)
+	Parser.add_argument("--engine", default="python", choices=("python", "numpy"))
+	args:argparse.Namespace = Parser.parse_args(argv)
+
+	mods_list:list = [ "" if mods.upper() == "NM" else mods.upper() for mods in args.mods.split(",") ]
+
+	Output:TextIO = sys.stdout
+	if args.output != "-":
+		Output = open(args.output, mode='w', encoding="UTF-8", newline="")
+
+	try:
+		summary:dict = runBatch(
+			args.inputs, mods_list, Output,
+			output_format=args.output_format, workers=args.workers, chunksize=args.chunksize,
+			accuracy=args.accuracy, engine=args.engine
+		)
+	finally:
+		if Output is not sys.stdout:
+			Output.close()
+
+	print(
+		f"{summary['files']} maps ({summary['ok']} ok, {summary['failed']} failed), "
+		f"{summary['results']} results in {round(summary['seconds'], 2)}s",
+		file=sys.stderr
+	)
+	return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
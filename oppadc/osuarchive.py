@@ -0,0 +1,41 @@
+"""
+	reading maps straight out of .osz archives (zip files of a mapset), nothing is extracted
+
+	only the .osu members are read (streamed, one after another),
+	audio, images, videos and storyboards in the archive are never touched
+"""
+from typing import Generator, BinaryIO
+
+import zipfile
+from .osumap import OsuMap
+
+OSU_EXTENSION:str = ".osu"
+
+def osuMembers(Archive:zipfile.ZipFile) -> list:
+	"""
+		names of all .osu members of Archive, in archive order
+	"""
+	return [
+		Info.filename for Info in Archive.infolist()
+		if not Info.is_dir() and Info.filename.lower().endswith(OSU_EXTENSION)
+	]
+
+def iterOsz(archive:str or BinaryIO or zipfile.ZipFile, **kwargs:dict) -> Generator[OsuMap, None, None]:
+	"""
+		yields a OsuMap for every .osu member of the .osz archive
+		(path, binary file object or zipfile.ZipFile), kwargs are given to OsuMap.fromArchive().
+		with modes, maps of other modes are skipped like in OsuMap.scanHeader()
+	"""
+	Archive:zipfile.ZipFile = archive if isinstance(archive, zipfile.ZipFile) else zipfile.ZipFile(archive)
+
+	try:
+		for member in osuMembers(Archive):
+			Map:OsuMap = OsuMap.fromArchive(Archive, member, **kwargs)
+			if Map.skipped: continue
+
+			yield Map
+
+	finally:
+		# only close what we opened
+		if Archive is not archive:
+			Archive.close()
@@ -0,0 +1,50 @@
+"""
+	asyncio entry points, loading and calculating never blocks the event loop
+
+	Map = await oppadc.aload("path/to/map.osu")
+	PP = await Map.agetPP("HDHR", accuracy=98.5)
+
+	the work runs in an executor (None = the default executor of the loop,
+	a ThreadPoolExecutor or a ProcessPoolExecutor can be given),
+	or with chunk_size, on the event loop itself in small steps
+"""
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+	from .osustats import OsuStats
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+
+async def aload(file_path:str, executor:Executor=None, cached:bool=True, columnar:bool=False, lazy:bool=False) -> "OsuMap":
+	"""
+		awaitable oppadc.load(), with cached=False the map is always parsed (OsuMap(file_path=...)).
+		lazy only works with cached=False, the cache keeps completely parsed maps
+	"""
+	from .osumap import OsuMap
+	from .osumapcache import load
+
+	work:functools.partial
+	if cached:
+		if lazy: raise ValueError("lazy maps can't be cached, use cached=False")
+		work = functools.partial(load, file_path, columnar=columnar)
+	else:
+		work = functools.partial(OsuMap, file_path=file_path, columnar=columnar, lazy=lazy)
+
+	return await asyncio.get_running_loop().run_in_executor(executor, work)
+
+def calcResults(Map:"OsuMap", Mods:object, recalculate:bool, engine:str, kwargs:dict) -> tuple:
+	"""
+		Map.getPP() in an executor, returns ( Difficulty, Stats, PP ),
+		so results of a map copy in an other process can be taken back
+	"""
+	PP = Map.getPP(Mods=Mods, recalculate=recalculate, engine=engine, **kwargs)
+	return ( PP.Stats.Difficulty, PP.Stats, PP )
+
+async def calcStatsChunked(Stats:"OsuStats", chunk_size:int=1000, singletap_threshold:int=125) -> None:
+	"""
+		Stats.calc() on the event loop, other tasks can run after every chunk_size hit objects
+	"""
+	for _ in Stats.calcSteps(singletap_threshold=singletap_threshold, chunk_size=chunk_size):
+		await asyncio.sleep(0)
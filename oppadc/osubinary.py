@@ -0,0 +1,148 @@
+"""
+	compact binary format for parsed maps, see OsuMap.dump() and OsuMap.load()
+
+	everything is little-endian:
+		magic (6 bytes) + binary version (uint16)
+		header struct (BINARY_HEADER)
+		strings: uint32 length + UTF-8, in order of BINARY_STRINGS, then the tags (uint32 amount + strings)
+		timing points: one array per column (starttime, ms_per_beat, change)
+		hit objects: one array per column (starttime, x, y, type, repetitions, distance, endtime)
+		slider curves: one string, the curve of every hit object separated by "\n"
+
+	all arrays are read with a single read each, nothing is tokenized
+"""
+from typing import TYPE_CHECKING, BinaryIO
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+
+import sys
+import struct
+from array import array
+from .osuobjectstore import OsuHitObjectStore
+from .osutimingpoint import OsuTimingPoint
+
+BINARY_MAGIC:bytes = b"OPPADC"
+BINARY_VERSION:int = 1
+
+# format_version, mode, map_id, mapset_id, hp, cs, od, ar, slider_multiplier, slider_tick_rate,
+# amount_circle, amount_slider, amount_spinner, amount timing points, amount hit objects
+BINARY_HEADER:struct.Struct = struct.Struct("<iiqq6d5I")
+BINARY_STRINGS:tuple = ("title", "title_unicode", "artist", "artist_unicode", "creator", "version", "source")
+
+HITOBJECT_COLUMNS:tuple = ( ("starttime", 'd'), ("x", 'd'), ("y", 'd'), ("type", 'B'), ("repetitions", 'i'), ("distance", 'd'), ("endtime", 'd') )
+TIMINGPOINT_COLUMNS:tuple = ( ("starttime", 'd'), ("ms_per_beat", 'd'), ("change", 'B') )
+
+def dumpMap(Map:"OsuMap", fp:BinaryIO) -> None:
+	"""
+		writes Map into the binary file object fp
+	"""
+	Store:OsuHitObjectStore = Map.hitobjects
+	if not isinstance(Store, OsuHitObjectStore):
+		Store = OsuHitObjectStore.fromObjects(Map.hitobjects)
+
+	fp.write(BINARY_MAGIC)
+	fp.write(struct.pack("<H", BINARY_VERSION))
+	fp.write(BINARY_HEADER.pack(
+		Map.format_version, -1 if Map.mode is None else Map.mode, Map.map_id, Map.mapset_id,
+		Map.hp, Map.cs, Map.od, Map.ar, Map.slider_multiplier, Map.slider_tick_rate,
+		Map.amount_circle, Map.amount_slider, Map.amount_spinner, len(Map.timingpoints), len(Store)
+	))
+
+	for name in BINARY_STRINGS:
+		writeString(fp, getattr(Map, name))
+
+	fp.write(struct.pack("<I", len(Map.tags)))
+	for tag in Map.tags:
+		writeString(fp, tag)
+
+	timing_columns:dict = {
+		"starttime": array('d', (TPoint.starttime for TPoint in Map.timingpoints)),
+		"ms_per_beat": array('d', (TPoint.ms_per_beat for TPoint in Map.timingpoints)),
+		"change": array('B', (TPoint.change for TPoint in Map.timingpoints)),
+	}
+	for name, _typecode in TIMINGPOINT_COLUMNS:
+		writeArray(fp, timing_columns[name])
+
+	for name, _typecode in HITOBJECT_COLUMNS:
+		writeArray(fp, getattr(Store, name))
+
+	writeString(fp, "\n".join(Store.curve))
+
+def loadMap(cls:type, fp:BinaryIO, columnar:bool=False) -> "OsuMap":
+	"""
+		reads a map written by dumpMap() from the binary file object fp,
+		cls is the OsuMap class that gets created
+	"""
+	magic:bytes = fp.read(len(BINARY_MAGIC))
+	if magic != BINARY_MAGIC:
+		raise SyntaxError("not a oppadc binary map")
+
+	version:int = struct.unpack("<H", readExact(fp, 2))[0]
+	if version != BINARY_VERSION:
+		raise SyntaxError(f"unsupported binary map version: {version}")
+
+	Map:"OsuMap" = cls(auto_parse=False, columnar=columnar)
+
+	(
+		Map.format_version, mode, Map.map_id, Map.mapset_id,
+		Map.hp, Map.cs, Map.od, Map.ar, Map.slider_multiplier, Map.slider_tick_rate,
+		Map.amount_circle, Map.amount_slider, Map.amount_spinner, amount_timingpoints, amount_hitobjects
+	) = BINARY_HEADER.unpack( readExact(fp, BINARY_HEADER.size) )
+	Map.mode = None if mode < 0 else mode
+
+	for name in BINARY_STRINGS:
+		setattr(Map, name, readString(fp))
+
+	amount_tags:int = struct.unpack("<I", readExact(fp, 4))[0]
+	Map.tags = [readString(fp) for _ in range(amount_tags)]
+
+	timing_columns:list = [ readArray(fp, typecode, amount_timingpoints) for _name, typecode in TIMINGPOINT_COLUMNS ]
+	Map.timingpoints = [
+		OsuTimingPoint(starttime=starttime, ms_per_beat=ms_per_beat, change=change)
+		for starttime, ms_per_beat, change in zip(*timing_columns)
+	]
+
+	Store:OsuHitObjectStore = OsuHitObjectStore()
+	for name, typecode in HITOBJECT_COLUMNS:
+		setattr(Store, name, readArray(fp, typecode, amount_hitobjects))
+
+	curves:str = readString(fp)
+	Store.curve = curves.split("\n") if amount_hitobjects else []
+
+	Map.hitobjects = Store if columnar else list(Store)
+	Map.done = True
+
+	return Map
+
+# utils
+def readExact(fp:BinaryIO, size:int) -> bytes:
+	data:bytes = fp.read(size)
+	if len(data) != size:
+		raise SyntaxError("binary map ended unexpectedly")
+
+	return data
+
+def writeString(fp:BinaryIO, value:str) -> None:
+	data:bytes = value.encode("UTF-8")
+	fp.write(struct.pack("<I", len(data)))
+	fp.write(data)
+
+def readString(fp:BinaryIO) -> str:
+	size:int = struct.unpack("<I", readExact(fp, 4))[0]
+	return readExact(fp, size).decode("UTF-8")
+
+def writeArray(fp:BinaryIO, values:array) -> None:
+	if sys.byteorder == "big":
+		values = array(values.typecode, values)
+		values.byteswap()
+
+	fp.write(values.tobytes())
+
+def readArray(fp:BinaryIO, typecode:str, amount:int) -> array:
+	values:array = array(typecode)
+	values.frombytes( readExact(fp, values.itemsize * amount) )
+
+	if sys.byteorder == "big":
+		values.byteswap()
+
+	return values
@@ -0,0 +1,167 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+
+import time
+import sqlite3
+import threading
+from .osustats import OsuStats
+from .osudifficulty import OsuDifficulty
+
+# everything stored per ( content hash, mods, engine, library version )
+CACHE_STATS:tuple = ("total", "aim", "speed", "aim_difficulty", "speed_difficulty", "aim_length_bonus", "speed_length_bonus", "amount_singles", "amount_singles_threshold")
+CACHE_DIFFICULTY:tuple = ("ar", "cs", "od", "hp", "speed_multiplier")
+CACHE_MAP:tuple = ("max_combo", "amount_circle", "amount_slider", "amount_spinner")
+
+class OsuResultCache(object):
+	"""
+		persistent cache for the results of OsuMap.getStats/getDifficulty, in a SQLite file.
+		entries are keyed by a hash of the map content, the mods value, the engine and the library version,
+		so a new version (a formula change) never returns old results.
+
+		the cache is bounded to max_entries (least recently used are removed first)
+		and max_age in seconds (None for no limit)
+
+		use it by giving it to a map:
+			Cache = OsuResultCache("results.sqlite")
+			Map = OsuMap(file_path="path/to/map.osu", Cache=Cache)
+	"""
+	def __init__(self, path:str, max_entries:int=100000, max_age:float=None):
+		from . import __version__
+
+		self.path:str = path
+		self.max_entries:int = max_entries
+		self.max_age:float = max_age
+		self.version:str = __version__
+
+		self.hits:int = 0
+		self.misses:int = 0
+
+		self.__lock:threading.Lock = threading.Lock()
+		self.__connection:sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+
+		columns:str = ", ".join( CACHE_STATS + CACHE_DIFFICULTY + CACHE_MAP )
+		with self.__lock, self.__connection:
+			self.__connection.execute(f"""
+				CREATE TABLE IF NOT EXISTS results (
+					hash TEXT, mods INTEGER, engine TEXT, version TEXT,
+					created REAL, used REAL,
+					{columns},
+					PRIMARY KEY (hash, mods, engine, version)
+				)
+			""")
+			self.__connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} path='{self.path}' hits={self.hits} misses={self.misses}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		with self.__lock:
+			return self.__connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+	def get(self, content_hash:str, mods_value:int, engine:str="python") -> dict:
+		"""
+			returns the stored values as dict, or None if there is nothing (or its too old)
+		"""
+		names:tuple = CACHE_STATS + CACHE_DIFFICULTY + CACHE_MAP
+		now:float = time.time()
+
+		with self.__lock, self.__connection:
+			row:tuple = self.__connection.execute(
+				f"SELECT created, {', '.join(names)} FROM results WHERE hash = ? AND mods = ? AND engine = ? AND version = ?",
+				(content_hash, mods_value, engine, self.version)
+			).fetchone()
+
+			if row and self.max_age is not None and row[0] < (now - self.max_age):
+				row = None
+
+			if not row:
+				self.misses += 1
+				return None
+
+			self.__connection.execute(
+				"UPDATE results SET used = ? WHERE hash = ? AND mods = ? AND engine = ? AND version = ?",
+				(now, content_hash, mods_value, engine, self.version)
+			)
+
+		self.hits += 1
+		return dict( zip(names, row[1:]) )
+
+	def put(self, content_hash:str, mods_value:int, values:dict, engine:str="python") -> None:
+		"""
+			stores values (everything in CACHE_STATS, CACHE_DIFFICULTY and CACHE_MAP)
+			and removes old entries
+		"""
+		names:tuple = CACHE_STATS + CACHE_DIFFICULTY + CACHE_MAP
+		now:float = time.time()
+
+		with self.__lock, self.__connection:
+			self.__connection.execute(
+				f"INSERT OR REPLACE INTO results (hash, mods, engine, version, created, used, {', '.join(names)}) VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' for _ in names)})",
+				(content_hash, mods_value, engine, self.version, now, now) + tuple(values[name] for name in names)
+			)
+
+			if self.max_age is not None:
+				self.__connection.execute("DELETE FROM results WHERE created < ?", (now - self.max_age,))
+
+			self.__connection.execute(
+				"DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+				(self.max_entries,)
+			)
+
+	def hashes(self) -> set:
+		"""
+			content hashes (OsuMap.contentHash()) of every map with stored results of this version
+		"""
+		with self.__lock:
+			return { row[0] for row in self.__connection.execute("SELECT DISTINCT hash FROM results WHERE version = ?", (self.version,)) }
+
+	def clear(self) -> None:
+		with self.__lock, self.__connection:
+			self.__connection.execute("DELETE FROM results")
+
+	def close(self) -> None:
+		with self.__lock:
+			self.__connection.close()
+
+	# map utils
+	def getStats(self, Map:"OsuMap", Difficulty:OsuDifficulty, engine:str="python") -> OsuStats:
+		"""
+			returns a OsuStats with the stored values for Map, the mods of Difficulty and engine,
+			also sets the stored difficulty values on Difficulty. None if nothing is stored.
+			the stored max combo and amount of objects are in Stats.map_values,
+			so the pp can be calculated without walking (or for lazy maps: parsing) the hit objects
+		"""
+		values:dict = self.get(Map.contentHash(), Difficulty.mods_value, engine)
+		if values is None: return None
+
+		for name in CACHE_DIFFICULTY:
+			setattr(Difficulty, name, values[name])
+
+		Stats:OsuStats = OsuStats(Map, Difficulty)
+		Stats.engine = engine
+		for name in CACHE_STATS:
+			setattr(Stats, name, values[name])
+		Stats.map_values = { name: values[name] for name in CACHE_MAP }
+
+		return Stats
+
+	def putStats(self, Map:"OsuMap", Difficulty:OsuDifficulty, Stats:OsuStats) -> None:
+		"""
+			stores the results of Stats (calculated for Map with Difficulty, by the engine of Stats)
+		"""
+		values:dict = {}
+		for name in CACHE_STATS:
+			values[name] = getattr(Stats, name)
+		for name in CACHE_DIFFICULTY:
+			values[name] = getattr(Difficulty, name)
+
+		values["max_combo"] = Map.maxCombo()
+		values["amount_circle"] = Map.amount_circle
+		values["amount_slider"] = Map.amount_slider
+		values["amount_spinner"] = Map.amount_spinner
+
+		self.put(Map.contentHash(), Difficulty.mods_value, values, Stats.engine)
@@ -0,0 +1,234 @@
+"""
+	streaming reader for the osu!.db of osu! stable, which already knows every installed map
+
+		with OsuDb("osu!.db") as Db:
+			for Beatmap in Db.beatmaps(skip_hashes=Cache.hashes(), modes=(MODE_STD,)):
+				Map = Beatmap.loadMap("C:/osu!/Songs")
+
+	only one entry is read at a time, timing points and star ratings of other modes are skipped
+	without decoding them. the entries only hold metadata (named like the attributes of OsuMap),
+	for a calculation the .osu has to be parsed (see OsuDbBeatmap.loadMap())
+
+	format: https://github.com/ppy/osu/wiki/Legacy-database-file-structure
+"""
+from typing import Generator, BinaryIO
+
+import os
+import struct
+from .osumap import OsuMap
+
+# versions where the format changed
+OSUDB_VERSION_FLOAT_DIFFICULTY:int = 20140609 # difficulty values as single instead of byte, star ratings
+OSUDB_VERSION_NO_ENTRY_SIZE:int = 20191106 # entries don't start with their size anymore
+OSUDB_VERSION_FLOAT_STARS:int = 20250107 # star ratings as single instead of double
+
+STRUCT_SHORT:struct.Struct = struct.Struct("<H")
+STRUCT_INT:struct.Struct = struct.Struct("<i")
+STRUCT_LONG:struct.Struct = struct.Struct("<q")
+STRUCT_SINGLE:struct.Struct = struct.Struct("<f")
+STRUCT_DOUBLE:struct.Struct = struct.Struct("<d")
+
+# 0x08, mods, 0x0d, star rating
+STRUCT_STARS_DOUBLE:struct.Struct = struct.Struct("<xixd")
+STRUCT_STARS_SINGLE:struct.Struct = struct.Struct("<xixf")
+
+TIMINGPOINT_SIZE:int = 17 # double bpm, double offset, bool uninherited
+
+class OsuDbBeatmap(object):
+	"""
+		one map of the osu!.db, attributes are named like the ones of OsuMap
+		md5 is the hash osu! uses for the .osu file, stars the nomod star rating (0.0 if unknown)
+	"""
+	__slots__ = (
+		"artist", "artist_unicode", "title", "title_unicode", "creator", "version", "audio_file", "md5", "file_name",
+		"ranked_status", "amount_circle", "amount_slider", "amount_spinner", "last_modified",
+		"ar", "cs", "hp", "od", "slider_multiplier", "stars", "drain_time", "total_length",
+		"map_id", "mapset_id", "mode", "source", "tags", "folder"
+	)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} title='{self.title}' version='{self.version}' set={self.mapset_id} map={self.map_id}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def filePath(self, songs_path:str) -> str:
+		"""
+			path of the .osu in the songs folder of osu! (songs_path)
+		"""
+		return os.path.join(songs_path, self.folder, self.file_name)
+
+	def loadMap(self, songs_path:str, **kwargs:dict) -> OsuMap:
+		"""
+			parses the .osu of this map, kwargs are given to OsuMap()
+		"""
+		return OsuMap(file_path=self.filePath(songs_path), **kwargs)
+
+class OsuDb(object):
+	"""
+		reads a osu!.db from fp (path or binary file object),
+		the header is read directly, the maps while iterating (only once)
+	"""
+	def __init__(self, fp:str or BinaryIO):
+		self.__own:bool = isinstance(fp, str)
+		self.fp:BinaryIO = open(fp, mode='rb') if self.__own else fp
+
+		self.osu_version:int = self.readInt()
+		self.folder_count:int = self.readInt()
+		self.account_unlocked:bool = self.readBool()
+		self.unlock_date:int = self.readLong()
+		self.player:str = self.readString()
+		self.amount:int = self.readInt()
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} version={self.osu_version} player='{self.player}' maps={self.amount}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return self.amount
+
+	def __enter__(self) -> "OsuDb":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __iter__(self) -> Generator[OsuDbBeatmap, None, None]:
+		for _ in range(self.amount):
+			yield self.readBeatmap()
+
+	def close(self) -> None:
+		"""
+			closes the file, if it was opened from a path
+		"""
+		if self.__own:
+			self.fp.close()
+
+	def beatmaps(self, skip_hashes:set=None, modes:tuple=None) -> Generator[OsuDbBeatmap, None, None]:
+		"""
+			yields every map, except the ones with a md5 in skip_hashes
+			(md5 hex digests like OsuMap.contentHash(), for example OsuResultCache.hashes())
+			and the ones with a mode not in modes
+		"""
+		for Beatmap in self:
+			if skip_hashes is not None and Beatmap.md5 in skip_hashes: continue
+			if modes is not None and Beatmap.mode not in modes: continue
+
+			yield Beatmap
+
+	def readBeatmap(self) -> OsuDbBeatmap:
+		version:int = self.osu_version
+		Beatmap:OsuDbBeatmap = OsuDbBeatmap()
+
+		if version < OSUDB_VERSION_NO_ENTRY_SIZE:
+			self.readInt()
+
+		Beatmap.artist = self.readString()
+		Beatmap.artist_unicode = self.readString()
+		Beatmap.title = self.readString()
+		Beatmap.title_unicode = self.readString()
+		Beatmap.creator = self.readString()
+		Beatmap.version = self.readString()
+		Beatmap.audio_file = self.readString()
+		Beatmap.md5 = self.readString()
+		Beatmap.file_name = self.readString()
+
+		Beatmap.ranked_status = self.readByte()
+		Beatmap.amount_circle = self.readShort()
+		Beatmap.amount_slider = self.readShort()
+		Beatmap.amount_spinner = self.readShort()
+		Beatmap.last_modified = self.readLong()
+
+		read_difficulty = self.readSingle if version >= OSUDB_VERSION_FLOAT_DIFFICULTY else self.readByte
+		Beatmap.ar = read_difficulty()
+		Beatmap.cs = read_difficulty()
+		Beatmap.hp = read_difficulty()
+		Beatmap.od = read_difficulty()
+		Beatmap.slider_multiplier = self.readDouble()
+
+		# star ratings of std, taiko, ctb and mania, only the nomod std one is kept
+		Beatmap.stars = 0.0
+		if version >= OSUDB_VERSION_FLOAT_DIFFICULTY:
+			Stars:struct.Struct = STRUCT_STARS_SINGLE if version >= OSUDB_VERSION_FLOAT_STARS else STRUCT_STARS_DOUBLE
+			for mode in range(4):
+				amount:int = self.readInt()
+				data:bytes = self.read(amount * Stars.size)
+				if mode != 0: continue
+
+				for mods, stars in Stars.iter_unpack(data):
+					if mods == 0: Beatmap.stars = stars
+
+		Beatmap.drain_time = self.readInt() * 1000.0 # stored in seconds
+		Beatmap.total_length = float(self.readInt())
+		self.readInt() # audio preview time
+
+		self.read(self.readInt() * TIMINGPOINT_SIZE)
+
+		Beatmap.map_id = self.readInt()
+		Beatmap.mapset_id = self.readInt()
+		self.read(4 + 4 + 2 + 4) # thread id, grades, local offset, stack leniency
+		Beatmap.mode = self.readByte()
+		Beatmap.source = self.readString()
+		Beatmap.tags = self.readString().split()
+		self.readShort() # online offset
+		self.readString() # title font
+		self.read(1 + 8 + 1) # unplayed, last played, osz2
+		Beatmap.folder = self.readString()
+		self.read(8 + 5) # last checked, ignore sound/skin, disable storyboard/video, visual override
+
+		if version < OSUDB_VERSION_FLOAT_DIFFICULTY:
+			self.readShort()
+
+		self.read(4 + 1) # last modification time, mania scroll speed
+
+		return Beatmap
+
+	# primitives
+	def read(self, size:int) -> bytes:
+		data:bytes = self.fp.read(size)
+		if len(data) != size:
+			raise SyntaxError("osu!.db ended unexpectedly")
+
+		return data
+
+	def readByte(self) -> int:
+		return self.read(1)[0]
+
+	def readBool(self) -> bool:
+		return self.read(1)[0] != 0
+
+	def readShort(self) -> int:
+		return STRUCT_SHORT.unpack(self.read(2))[0]
+
+	def readInt(self) -> int:
+		return STRUCT_INT.unpack(self.read(4))[0]
+
+	def readLong(self) -> int:
+		return STRUCT_LONG.unpack(self.read(8))[0]
+
+	def readSingle(self) -> float:
+		return STRUCT_SINGLE.unpack(self.read(4))[0]
+
+	def readDouble(self) -> float:
+		return STRUCT_DOUBLE.unpack(self.read(8))[0]
+
+	def readString(self) -> str:
+		"""
+			0x00 for no string, or 0x0b + ULEB128 length + UTF-8
+		"""
+		flag:int = self.readByte()
+		if flag == 0x00: return ""
+		if flag != 0x0b:
+			raise SyntaxError(f"invalid string in osu!.db: {flag:#x}")
+
+		size:int = 0
+		shift:int = 0
+		while True:
+			byte:int = self.readByte()
+			size |= (byte & 0x7f) << shift
+			if not byte & 0x80: break
+			shift += 7
+
+		return self.read(size).decode("UTF-8")
@@ -31,16 +31,28 @@ class OsuDifficulty(object):
 	def __str__(self) -> str:
 		return self.__repr__()
 
-	def applyMods(self, Mods:GeneralOsuMod or list or str or int=None, calc:list=["AR","OD","CS","HP"]) -> None:
-		if not Mods: return
+	@staticmethod
+	def modsValue(Mods:GeneralOsuMod or list or str or int=None) -> int:
+		"""
+			returns the mod value of everything applyMods() takes
+		"""
+		if not Mods: return 0
 
-		mods_value:int = 0
 		if type(Mods) is int:
-			mods_value = Mods
+			return Mods
 		elif type(Mods) is str:
-			mods_value = OsuModIndex.getValueFromString(Mods)
+			return OsuModIndex.getValueFromString(Mods)
 		elif type(Mods) is GeneralOsuMod:
-			mods_value = Mods.value
+			return Mods.value
+		elif type(Mods) is list:
+			return OsuModIndex.getValueFromList(Mods)
+
+		return 0
+
+	def applyMods(self, Mods:GeneralOsuMod or list or str or int=None, calc:list=["AR","OD","CS","HP"]) -> None:
+		if not Mods: return
+
+		mods_value:int = self.modsValue(Mods)
 
 		self.mods_value = mods_value
 		self.mods_str = OsuModIndex.getStringFromValue(mods_value)
@@ -1,33 +1,133 @@
-from typing import Generator, Iterator
-
+from typing import Generator, Iterator, BinaryIO
+from concurrent.futures import Executor
+
+import os
+import re
+import io
+import mmap
+import codecs
+import contextlib
+import asyncio
+import functools
 import math
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
 from .osumod import GeneralOsuMod
 from .osustats import OsuStats
 from .osudifficulty import OsuDifficulty
-from .osupp import OsuPP
+from .osupp import OsuPP, OsuPPTable
+from .osutimeline import OsuTimeline
 from .osutimingpoint import OsuTimingPoint
+from .osutimingindex import OsuTimingIndex
+from .osuslider import OsuSliderPath, sliderPath
+from .osuobjectstore import OsuHitObjectStore, hitObjectColumns
+from .osubinary import dumpMap, loadMap
+from .osucache import OsuResultCache
+from .osuprofile import OsuTimings
+from .osuasync import calcResults, calcStatsChunked
 from .osuobject import (
 	OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER, OSU_OBJ_SPINNER,
 	OsuHitObjectCircle, OsuHitObjectSlider, OsuHitObjectSpinner
 )
 from .osugamemode import MODE_STD
 
+# attributes that are set by a section, used for lazy parsing
+SECTION_ATTRIBUTES:dict = {
+	"General": ("mode",),
+	"Metadata": ("title", "title_unicode", "artist", "artist_unicode", "creator", "version", "source", "tags", "map_id", "mapset_id"),
+	"Difficulty": ("hp", "cs", "od", "ar", "slider_multiplier", "slider_tick_rate"),
+	"TimingPoints": ("timingpoints",),
+	"HitObjects": ("hitobjects", "amount_circle", "amount_slider", "amount_spinner"),
+}
+
+# attribute -> section that sets it
+ATTRIBUTE_SECTIONS:dict = { attribute: section for section, attributes in SECTION_ATTRIBUTES.items() for attribute in attributes }
+
+# enough for indexing, see OsuMap.scanHeader()
+HEADER_SECTIONS:tuple = ("General", "Metadata", "Difficulty")
+
+SECTION_HEADER_STR:"re.Pattern" = re.compile(r"^\[([^\]\r\n]*)\]", re.M)
+SECTION_HEADER_BYTES:"re.Pattern" = re.compile(rb"^\[([^\]\r\n]*)\]", re.M)
+BUFFER_CHUNK_SIZE:int = 1<<16 # bytes decoded at once from raw_bytes or a memory mapped file
+
+def bufferLines(Buffer:bytes or memoryview or mmap.mmap) -> Generator[str, None, None]:
+	"""
+		yields the lines of Buffer, decoded in chunks of BUFFER_CHUNK_SIZE,
+		so the whole content never exists as str at once
+	"""
+	Decoder:codecs.IncrementalDecoder = codecs.getincrementaldecoder("UTF-8")()
+	rest:str = ""
+
+	for start in range(0, len(Buffer), BUFFER_CHUNK_SIZE):
+		lines:list = (rest + Decoder.decode( Buffer[start:start+BUFFER_CHUNK_SIZE] )).split("\n")
+		rest = lines.pop()
+		for line in lines:
+			yield line
+
+	rest += Decoder.decode(b"", final=True)
+	if rest:
+		yield rest
+
 class OsuMap(object):
 	"""
 		contains all meta data about a map
 		holds the calculated results for pp in self.Calc
 		and difficulty with applied mods n self.Diff (self.ar, cs, etc... contains the unmodified version)
+
+		with lazy=True, parse() only finds the position of every [Section],
+		a section is parsed the first time one of its attributes is accessed (see SECTION_ATTRIBUTES)
+
+		with sections, only these sections are parsed and reading stops as soon as all of them are done,
+		General is always added to TimingPoints and HitObjects, the hit objects depend on its mode.
+		with modes, reading stops as soon as the mode is known to be not in modes (self.skipped is set)
+
+		with a Cache (OsuResultCache), getStats() first looks for stored results of the same map content and mods
+
+		with profile=True, the time parse() takes is recorded in self.Timings (OsuTimings)
+
+		calculated results (getDifficulty/getStats/getPP) are stored per mods, up to max_results
+
+		with archive (path or zipfile.ZipFile of a .osz) and member, the map is read from
+		that member of the archive without extracting it, see fromArchive()
+
+		the content can also be given as raw_bytes (bytes, bytearray, memoryview) or file_object
+		(binary file object, read once and not closed by the map), both are decoded line by line.
+		with use_mmap=True, file_path is memory mapped instead of read.
+		with keep_source=False, raw_str, raw_bytes and file_object are dropped once everything is parsed
 	"""
-	def __init__(self, file_path:str=None, raw_str:str=None, auto_parse:bool=True):
-		self.__Diff:OsuDifficulty = None
-		self.__Stat:OsuStats = None
-		self.__PP:OsuPP = None
+	def __init__(self, file_path:str=None, raw_str:str=None, auto_parse:bool=True, columnar:bool=False, lazy:bool=False, sections:tuple=None, modes:tuple=None, Cache:OsuResultCache=None, profile:bool=False, max_results:int=64, archive:str or zipfile.ZipFile=None, member:str=None, raw_bytes:bytes or memoryview=None, file_object:BinaryIO=None, use_mmap:bool=False, keep_source:bool=True):
+		self.__section_lock:threading.RLock = threading.RLock() # see loadSection()
+		self.__results:OrderedDict = OrderedDict() # see getResult()
+		self.__last:dict = {} # kind -> mods value of the last result
+		self.max_results:int = max_results
+		self.__aggregates:dict = None # see calcAggregates()
+		self.__timing_index:OsuTimingIndex = None
+		self.__slider_paths:dict = None # see sliderPaths()
+		self.__content_hash:str = None
+		self.Cache:OsuResultCache = Cache
+		self.Timings:OsuTimings = OsuTimings() if profile else None
 
 		# internal
 		self.file_path:str = file_path
 		self.raw_str:str = raw_str
+		self.raw_bytes:bytes or memoryview = raw_bytes
+		self.file_object:BinaryIO = file_object
+		self.use_mmap:bool = use_mmap
+		self.keep_source:bool = keep_source
+		self.archive:str or zipfile.ZipFile = archive
+		self.member:str = member
 		self.found:bool = False
 		self.done:bool = False
+		self.columnar:bool = columnar
+		self.lazy:bool = lazy
+		self.sections:tuple = sections
+		if sections is not None and "General" not in sections and {"TimingPoints", "HitObjects"} & set(sections):
+			self.sections = ("General",) + tuple(sections)
+		self.modes:tuple = modes
+		self.skipped:bool = False
+		self.__sections:dict = {} # name -> ( start, end ) of sections that are not parsed yet
 
 		# general
 		self.mode:int = None
@@ -58,11 +158,22 @@ class OsuMap(object):
 		self.amount_slider:int = 0
 		self.amount_spinner:int = 0
 		self.timingpoints:list = []
-		self.hitobjects:list = []
+		self.hitobjects:list or OsuHitObjectStore = OsuHitObjectStore() if columnar else []
 
 		if auto_parse:
 			self.parse()
 
+	def __getattr__(self, name:str):
+		# only called if name is not set, which happens for attributes of not yet parsed lazy sections
+		# loadSection() also waits for an other thread that is loading the section right now
+		section:str = ATTRIBUTE_SECTIONS.get(name)
+		if section and self.__dict__.get("_OsuMap__sections") is not None:
+			self.loadSection(section)
+			if name in self.__dict__:
+				return self.__dict__[name]
+
+		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
 	def __repr__(self) -> str:
 		return f"<{self.__class__.__name__} title='{self.title}' set={self.mapset_id} map={self.map_id}>"
 
@@ -117,22 +228,93 @@ class OsuMap(object):
 
 	# parse utils
 	def lineGenerator(self) -> Generator[str, None, None]:
-		if not self.raw_str and not self.file_path:
+		if not self.hasSource():
 			raise AttributeError("missing raw content or path to file")
 
 		elif self.raw_str:
 			for line in self.raw_str.splitlines():
 				yield line
 
-		elif self.file_path:
-			FileObject:Iterator[str] = open(self.file_path, mode='r', encoding="UTF-8")
-			self.found = True
-			for line in FileObject:
+		elif self.raw_bytes is not None:
+			for line in bufferLines(self.raw_bytes):
 				yield line
 
+		elif self.file_object is not None:
+			# a file object can only be read once, so its hashed on the way (see contentHash())
+			self.found = True
+			Hash:"hashlib._Hash" = hashlib.md5()
+			try:
+				for line in self.file_object:
+					Hash.update(line)
+					yield line.decode("UTF-8")
+			finally:
+				# parsing stopped early, the rest is still part of the content
+				for chunk in iter(functools.partial(self.file_object.read, BUFFER_CHUNK_SIZE), b""):
+					Hash.update(chunk)
+				self.__content_hash = Hash.hexdigest()
+
+		elif self.file_path and self.use_mmap:
+			with self.openMapped() as Buffer:
+				self.found = True
+				for line in bufferLines(Buffer):
+					yield line
+
+		elif self.file_path:
+			with open(self.file_path, mode='r', encoding="UTF-8") as FileObject:
+				self.found = True
+				for line in FileObject:
+					yield line
+
+		elif self.archive:
+			with self.openMember() as Member:
+				self.found = True
+				for line in io.TextIOWrapper(Member, encoding="UTF-8"):
+					yield line
+
 		else:
 			raise StopIteration()
 
+	def hasSource(self) -> bool:
+		return bool(self.raw_str or self.raw_bytes is not None or self.file_object is not None or self.file_path or self.archive)
+
+	@contextlib.contextmanager
+	def openMapped(self) -> Generator[mmap.mmap or bytes, None, None]:
+		"""
+			memory maps file_path (read only), closes the map and the file when the with block ends
+		"""
+		with open(self.file_path, mode='rb') as FileObject:
+			# empty files can't be mapped
+			if not os.fstat(FileObject.fileno()).st_size:
+				yield b""
+				return
+
+			with mmap.mmap(FileObject.fileno(), 0, access=mmap.ACCESS_READ) as Buffer:
+				yield Buffer
+
+	def dropSource(self) -> None:
+		"""
+			drops raw_str, raw_bytes and file_object, so their memory can be freed.
+			contentHash() is calculated before, so it stays the hash of the content
+		"""
+		if self.raw_str or self.raw_bytes is not None or self.file_object is not None:
+			self.contentHash()
+
+		self.raw_str = None
+		self.raw_bytes = None
+		self.file_object = None
+
+	def openMember(self) -> BinaryIO:
+		"""
+			opens self.member of self.archive (streamed, nothing is extracted),
+			the archive is closed together with the returned member if it was opened here
+		"""
+		if isinstance(self.archive, zipfile.ZipFile):
+			return self.archive.open(self.member)
+
+		# the member keeps the file open until it gets closed itself
+		with zipfile.ZipFile(self.archive) as Archive:
+			return Archive.open(self.member)
+
 	def parseProp(self, line) -> tuple:
 		"""
 			get prop from line, also strip white spaces from value
@@ -143,11 +325,55 @@ class OsuMap(object):
 
 		return (pair[0], pair[1].strip())
 
-	def parse(self) -> None:
+	def parse(self, columnar:bool=None, lazy:bool=None) -> None:
+		"""
+			parse the map from raw_str, raw_bytes, file_object, file_path or archive
+			if columnar is True, hit objects are stored in a OsuHitObjectStore
+			instead of a list of objects, None keeps the current setting
+			if lazy is True, only the section index is build, see parseIndex()
+		"""
+		if columnar is not None and columnar != self.columnar:
+			self.columnar = columnar
+			self.hitobjects = OsuHitObjectStore() if columnar else []
+
+		if lazy is not None:
+			self.lazy = lazy
+
+		if self.Timings is not None: self.Timings.start()
+		self.__aggregates = None
+		self.__timing_index = None
+		self.__slider_paths = None
+
+		if self.lazy:
+			self.parseIndex()
+			self.done = True
+			if self.Timings is not None: self.Timings.lap("parse_index", 0)
+			return
 
 		Source:Generator[str, None, None] = self.lineGenerator()
+		try:
+			self.parseLines(Source, sections=self.sections)
+		finally:
+			# closes the file, even if we stopped early
+			Source.close()
 
-		section:str = ""
+		# i did not know that this is a thing
+		if not self.ar:
+			self.ar = self.od
+
+		self.done = True
+		if not self.keep_source:
+			self.dropSource()
+
+		if self.Timings is not None: self.Timings.lap("parse", len(self.hitobjects))
+
+	def parseLines(self, Source:Iterator[str], section:str="", sections:tuple=None) -> None:
+		"""
+			parse all lines, starting in section
+			if sections is given, only these are parsed and it stops
+			when all of them are done (or [TimingPoints]/[HitObjects] is reached and not wanted)
+		"""
+		remaining:set = set(sections) if sections is not None else None
 
 		for line in Source:
 			# ignore all types of commants
@@ -161,6 +387,15 @@ class OsuMap(object):
 			# change current section
 			if line.startswith("["):
 				section = line[1:-1]
+
+				if remaining is not None:
+					if not remaining: return
+					if section in ("TimingPoints", "HitObjects") and section not in remaining and not remaining & {"TimingPoints", "HitObjects"}: return
+					remaining.discard(section)
+
+				continue
+
+			if sections is not None and section and section not in sections:
 				continue
 
 			try:
@@ -172,6 +407,11 @@ class OsuMap(object):
 
 				elif section == "General":
 					self.parseGeneral(line)
+
+					# no need to read any further
+					if self.modes is not None and self.mode is not None and self.mode not in self.modes:
+						self.skipped = True
+						return
 				elif section == "Metadata":
 					self.parseMetadata(line)
 				elif section == "Difficulty":
@@ -184,11 +424,241 @@ class OsuMap(object):
 			except (ValueError, SyntaxError) as e:
 				raise e
 
-		# i did not know that this is a thing
-		if not self.ar:
-			self.ar = self.od
+	def parseIndex(self) -> None:
+		"""
+			finds the start and end of every [Section] without parsing it,
+			everything before the first section (the format version) is parsed directly.
+			attributes of the found sections are removed, so __getattr__ can load them on first access
+		"""
+		if self.raw_str:
+			self.indexContent(self.raw_str)
 
-		self.done = True
+		elif self.raw_bytes is not None or self.file_object is not None:
+			# a file object can only be read once, its content is kept for the sections
+			if self.raw_bytes is None:
+				self.raw_bytes = self.file_object.read()
+				self.file_object = None
+				self.found = True
+
+			self.indexContent(self.raw_bytes)
+
+		elif self.file_path and self.use_mmap:
+			# sections are read with seek later, so the map is only needed for the index
+			with self.openMapped() as Buffer:
+				self.found = True
+				self.indexContent(Buffer)
+
+		elif self.file_path:
+			with open(self.file_path, mode='rb') as FileObject:
+				content:bytes = FileObject.read()
+			self.found = True
+			self.indexContent(content)
+
+		elif self.archive:
+			with self.openMember() as Member:
+				content:bytes = Member.read()
+			self.found = True
+			self.indexContent(content)
+
+		else:
+			raise AttributeError("missing raw content or path to file")
+
+		# remove everything the sections will set, so it can be loaded on access
+		for name in self.__sections:
+			for attribute in SECTION_ATTRIBUTES[name]:
+				self.__dict__.pop(attribute, None)
+
+	def indexContent(self, content:str or bytes or memoryview or mmap.mmap) -> None:
+		"""
+			fills the section index of parseIndex() from content and parses everything before the first section
+		"""
+		headers:Iterator["re.Match"] = SECTION_HEADER_STR.finditer(content) if type(content) is str else SECTION_HEADER_BYTES.finditer(content)
+		found:list = [ (Match.group(1), Match.start(), Match.end()) for Match in headers ]
+
+		preamble:str or bytes = content[:found[0][1]] if found else content[:]
+		if type(preamble) is not str:
+			preamble = bytes(preamble).decode("UTF-8")
+		self.parseLines( preamble.splitlines() )
+
+		self.__sections = {}
+		for i, (name, _start, end) in enumerate(found):
+			section_end:int = found[i+1][1] if (i+1) < len(found) else len(content)
+			name = bytes(name).decode("UTF-8") if type(name) is not str else name
+
+			if name in SECTION_ATTRIBUTES:
+				self.__sections[name] = (end, section_end)
+
+	def loadSection(self, name:str) -> None:
+		"""
+			parse a section found by parseIndex(), does nothing if its already parsed
+
+			thread safe: the section is parsed into a separate map and all its attributes are
+			published at once, its index entry is only removed after that.
+			so other threads either wait for the section or see it complete
+		"""
+		with self.__section_lock:
+			position:tuple = self.__sections.get(name)
+			if not position: return
+
+			start, end = position
+			content:str
+			if self.raw_str:
+				content = self.raw_str[start:end]
+			elif self.raw_bytes is not None:
+				content = bytes(self.raw_bytes[start:end]).decode("UTF-8")
+			elif self.file_path:
+				with open(self.file_path, mode='rb') as FileObject:
+					FileObject.seek(start)
+					content = FileObject.read(end - start).decode("UTF-8")
+			else:
+				# compressed members can't seek cheaply, so the member is read up to the section
+				with self.openMember() as Member:
+					content = Member.read(end)[start:].decode("UTF-8")
+
+			# everything not in the section keeps its default, like with a full parse
+			Part:OsuMap = self.__class__(auto_parse=False, columnar=self.columnar, modes=self.modes)
+			Part.format_version = self.format_version
+			if name == "HitObjects":
+				Part.mode = self.mode
+
+			Part.parseLines( content.splitlines(), section=name )
+
+			# i did not know that this is a thing
+			if name == "Difficulty" and not Part.ar:
+				Part.ar = Part.od
+
+			self.__aggregates = None
+			self.__timing_index = None
+			self.__slider_paths = None
+
+			published:dict = { attribute: getattr(Part, attribute) for attribute in SECTION_ATTRIBUTES[name] }
+			if Part.skipped: published["skipped"] = True
+			self.__dict__.update(published)
+			del self.__sections[name]
+
+			if not self.__sections and not self.keep_source:
+				self.dropSource()
+
+	def loadSections(self) -> None:
+		"""
+			parse all sections that are not parsed yet
+		"""
+		for name in list(self.__sections):
+			self.loadSection(name)
+
+	@classmethod
+	def scanHeader(cls, file_path:str=None, raw_str:str=None, modes:tuple=(MODE_STD,), sections:tuple=HEADER_SECTIONS) -> "OsuMap":
+		"""
+			only reads the format version, [General], [Metadata] and [Difficulty],
+			stops reading right after them and right after the mode if its not in modes.
+			returns None for skipped maps (modes=None allows all)
+			good for indexing a lot of maps, every calculation needs a full parse
+		"""
+		Map:OsuMap = cls(file_path=file_path, raw_str=raw_str, sections=sections, modes=modes)
+		if Map.skipped: return None
+
+		return Map
+
+	def __getstate__(self) -> dict:
+		# for pickle (ProcessPoolExecutor), the result cache can't be send to other processes
+		state:dict = dict(self.__dict__)
+		state["Cache"] = None
+		state["file_object"] = None
+		del state["_OsuMap__section_lock"]
+		if isinstance(self.archive, zipfile.ZipFile):
+			state["archive"] = self.archive.filename
+		return state
+
+	def __setstate__(self, state:dict) -> None:
+		self.__dict__.update(state)
+		self.__section_lock = threading.RLock()
+
+	@classmethod
+	def fromArchive(cls, Archive:str or zipfile.ZipFile, member:str, **kwargs:dict) -> "OsuMap":
+		"""
+			reads the map from member (like "artist - title (creator) [version].osu")
+			of the .osz Archive (path or zipfile.ZipFile), streamed without extracting anything.
+			kwargs are given to OsuMap()
+
+			if Archive has no path (opened from a file object), it can't be opened again later,
+			so the member is read into raw_bytes
+		"""
+		if isinstance(Archive, zipfile.ZipFile) and not Archive.filename:
+			Map:OsuMap = cls(raw_bytes=Archive.read(member), **kwargs)
+			Map.member = member
+			return Map
+
+		Map:OsuMap = cls(archive=Archive, member=member, **kwargs)
+
+		# lazy sections and contentHash() open the archive again by its path,
+		# so the map doesn't depend on Archive staying open
+		if isinstance(Archive, zipfile.ZipFile) and Archive.filename:
+			Map.archive = Archive.filename
+
+		return Map
+
+	def copy(self) -> "OsuMap":
+		"""
+			returns a new map that shares all parsed data (hit objects, timing points, ...) with this one,
+			but has none of its calculated results, so both can calculate different mods
+		"""
+		Copy:OsuMap = self.__class__.__new__(self.__class__)
+		Copy.__dict__.update(self.__dict__)
+
+		Copy.__results = OrderedDict()
+		Copy.__last = {}
+		Copy.__section_lock = threading.RLock()
+		Copy.__sections = dict(self.__sections)
+
+		return Copy
+
+	def contentHash(self) -> str:
+		"""
+			md5 of the map content (raw_str, raw_bytes, file_object, the file or the archive member), used as cache key.
+			its the same hash osu! uses for a .osu (like OsuDbBeatmap.md5),
+			maps without any source (like loaded binary maps) are hashed by their binary dump
+		"""
+		if self.__content_hash: return self.__content_hash
+
+		# not parsed yet, the content is kept for parse()
+		if self.file_object is not None:
+			self.raw_bytes = self.file_object.read()
+			self.file_object = None
+
+		data:bytes
+		if self.raw_str:
+			data = self.raw_str.encode("UTF-8")
+		elif self.raw_bytes is not None:
+			data = bytes(self.raw_bytes)
+		elif self.file_path:
+			with open(self.file_path, mode='rb') as FileObject:
+				data = FileObject.read()
+		elif self.archive:
+			with self.openMember() as Member:
+				data = Member.read()
+		else:
+			Buffer:io.BytesIO = io.BytesIO()
+			self.dump(Buffer)
+			data = Buffer.getvalue()
+
+		self.__content_hash = hashlib.md5(data).hexdigest()
+		return self.__content_hash
+
+	# binary
+	def dump(self, fp:BinaryIO) -> None:
+		"""
+			writes the parsed map into the binary file object fp,
+			load it again with OsuMap.load(), see osubinary for the format
+		"""
+		dumpMap(self, fp)
+
+	@classmethod
+	def load(cls, fp:BinaryIO, columnar:bool=False) -> "OsuMap":
+		"""
+			reads a map written by dump() from the binary file object fp,
+			much faster than parsing the .osu again
+		"""
+		return loadMap(cls, fp, columnar=columnar)
 
 	def parseGeneral(self, line:str) -> None:
 		prop:tuple = self.parseProp(line)
@@ -278,6 +748,9 @@ class OsuMap(object):
 		if not (0 <= objtype <= 255):
 			raise SyntaxError("invalid hitobject type")
 
+		if self.columnar:
+			return self.parseHitObjectSTDColumnar(s, starttime, objtype)
+
 		# circle
 		# x, y, starttime, objtype, ?, ?, ?, ?, ?, ?, ?
 		if objtype & OSU_OBJ_CIRCLE:
@@ -294,98 +767,299 @@ class OsuMap(object):
 			self.amount_spinner += 1
 			self.hitobjects.append(Spinner)
 
-		# x, y, starttime, objtype, ?, repetitions, distance, ?, ?, ?, ?
+		# x, y, starttime, objtype, ?, curve, repetitions, distance, ?, ?, ?
 		elif objtype & OSU_OBJ_SLIDER:
 			if len(s) < 7:
 				raise SyntaxError("slider must have at least 7 fields")
 
-			Slider:OsuHitObjectSlider = OsuHitObjectSlider(starttime, repetitions=s[6], distance=s[7])
+			Slider:OsuHitObjectSlider = OsuHitObjectSlider(starttime, repetitions=s[6], distance=s[7], curve=s[5])
 			Slider.Pos.x = float(s[0])
 			Slider.Pos.y = float(s[1])
 
 			self.amount_slider += 1
 			self.hitobjects.append(Slider)
 
+	def parseHitObjectSTDColumnar(self, s:list, starttime:float, objtype:int) -> None:
+		# same as parseHitObjectSTD, but only fills the arrays of the OsuHitObjectStore
+		if objtype & OSU_OBJ_CIRCLE:
+			self.amount_circle += 1
+			self.hitobjects.append(starttime, float(s[0]), float(s[1]), OSU_OBJ_CIRCLE)
+
+		elif objtype & OSU_OBJ_SPINNER:
+			self.amount_spinner += 1
+			self.hitobjects.append(starttime, 0.0, 0.0, OSU_OBJ_SPINNER, endtime=float(s[5]))
+
+		elif objtype & OSU_OBJ_SLIDER:
+			if len(s) < 7:
+				raise SyntaxError("slider must have at least 7 fields")
+
+			self.amount_slider += 1
+			self.hitobjects.append(starttime, float(s[0]), float(s[1]), OSU_OBJ_SLIDER, repetitions=int(s[6]), distance=float(s[7]), curve=s[5])
+
 	# calculations
 	def maxCombo(self) -> int:
-		res:int = 0
+		return self.max_combo
 
-		timing_index:int = -1
-		CurrentTimingPoint:OsuTimingPoint = None
-		NextTimingPoint:OsuTimingPoint = OsuTimingPoint(starttime=0)
+	# aggregates, calculated once (see calcAggregates())
+	@property
+	def max_combo(self) -> int:
+		return self.calcAggregates()["max_combo"]
 
-		px_per_beat:float = 1.0
+	@property
+	def first_object_time(self) -> float:
+		return self.calcAggregates()["first_object_time"]
 
-		# everything that not a slider is worth +1
-		# sliders are another number duh
-		for Obj in self.hitobjects:
-			if not Obj.osu_obj & OSU_OBJ_SLIDER:
-				res += 1
-				continue
+	@property
+	def last_object_time(self) -> float:
+		return self.calcAggregates()["last_object_time"]
 
-			# slider combo calc, for that we need data from the object itself,
-			# as well data of the currently active timing point.
+	@property
+	def total_length(self) -> float:
+		return self.calcAggregates()["total_length"]
 
-			# when our object has a higher starttime that our next timing point,
-			# and we still have a next timingpoint
-			# then CurrentTimingPoint = NextTimingPoint
-			# and we try to get a next one, or set None to ignore loop
-			while NextTimingPoint is not None and Obj.starttime >= NextTimingPoint.starttime:
-				timing_index += 1
-				CurrentTimingPoint = self.timingpoints[timing_index]
+	@property
+	def drain_time(self) -> float:
+		return self.calcAggregates()["drain_time"]
 
-				# is there a next?
-				if len(self.timingpoints) > (timing_index + 1):
-					NextTimingPoint = self.timingpoints[timing_index + 1]
-				else:
-					NextTimingPoint = None
+	@property
+	def min_bpm(self) -> float:
+		return self.calcAggregates()["min_bpm"]
 
-				slider_speed_multiplier:float = 1.0
+	@property
+	def max_bpm(self) -> float:
+		return self.calcAggregates()["max_bpm"]
+
+	@property
+	def dominant_bpm(self) -> float:
+		return self.calcAggregates()["dominant_bpm"]
+
+	def calcAggregates(self) -> dict:
+		"""
+			calculates everything about the whole map in one walk over the hit objects,
+			only done once (and again after parse()):
+				max_combo: int
+				first_object_time, last_object_time: ms, start of the first and end of the last object
+				total_length: ms, from the start of the song to the end of the last object
+				drain_time: ms, from the first to the end of the last object (breaks are not parsed, so they count)
+				min_bpm, max_bpm, dominant_bpm: bpm of the uninherited timing points,
+					dominant is the one that lasts the longest between first and last object
+		"""
+		if self.__aggregates is not None: return self.__aggregates
+
+		max_combo:int = 0
+		first_object_time:float = 0.0
+		last_object_time:float = 0.0
+		for i, (_osu_obj, starttime, endtime, combo) in enumerate( self.objectSpans() ):
+			if i == 0: first_object_time = starttime
+			max_combo += combo
+			last_object_time = max(last_object_time, endtime)
+
+		# bpm, weighted by the time every uninherited timing point lasts
+		bpm_durations:dict = {}
+		red_points:list = [ TPoint for TPoint in self.timingpoints if TPoint.ms_per_beat > 0 ]
+		for i, TPoint in enumerate(red_points):
+			bpm:float = 60000 / TPoint.ms_per_beat
+			start:float = max(TPoint.starttime, first_object_time) if i else first_object_time
+			end:float = red_points[i + 1].starttime if i + 1 < len(red_points) else last_object_time
+			bpm_durations[bpm] = bpm_durations.get(bpm, 0.0) + max(0.0, min(end, last_object_time) - start)
+
+		self.__aggregates = dict(
+			max_combo=max_combo,
+			first_object_time=first_object_time,
+			last_object_time=last_object_time,
+			total_length=last_object_time,
+			drain_time=last_object_time - first_object_time,
+			min_bpm=min(bpm_durations, default=0.0),
+			max_bpm=max(bpm_durations, default=0.0),
+			dominant_bpm=max(bpm_durations, key=bpm_durations.get, default=0.0),
+		)
+		return self.__aggregates
+
+	def timingIndex(self) -> OsuTimingIndex:
+		"""
+			the OsuTimingIndex of the timing points, only build once (and again after parse())
+		"""
+		if self.__timing_index is None:
+			self.__timing_index = OsuTimingIndex(self)
+
+		return self.__timing_index
+
+	def sliderPaths(self) -> dict:
+		"""
+			{ hit object index: OsuSliderPath } for every slider of the map,
+			flattened together on first call and kept (until the next parse()).
+			columnar maps are read directly from the arrays, so nothing gets materialized
+		"""
+		if self.__slider_paths is not None: return self.__slider_paths
+
+		rows:Iterator[tuple] = zip(*hitObjectColumns(self.hitobjects, "type", "curve", "x", "y", "distance"))
+
+		self.__slider_paths = {
+			index: sliderPath(curve, x, y, distance)
+			for index, (osu_obj, curve, x, y, distance) in enumerate(rows)
+			if osu_obj & OSU_OBJ_SLIDER
+		}
+		return self.__slider_paths
+
+	def sliderPath(self, index:int) -> OsuSliderPath:
+		"""
+			OsuSliderPath of the slider at hit object index, see sliderPaths()
+		"""
+		Path:OsuSliderPath = self.sliderPaths().get(index)
+		if Path is None:
+			raise IndexError(f"hit object {index} is not a slider")
+
+		return Path
+
+	def objectCombos(self) -> Generator[int, None, None]:
+		"""
+			yields the combo every hit object is worth, in order of the hit objects
+		"""
+		for _osu_obj, _starttime, _endtime, combo in self.objectSpans():
+			yield combo
+
+	def objectSpans(self) -> Generator[tuple, None, None]:
+		"""
+			yields ( osu_obj, starttime, endtime, combo ) of every hit object, in order of the hit objects
+		"""
+		Index:OsuTimingIndex = self.timingIndex()
+
+		# columnar maps are read directly from the arrays, so nothing gets materialized
+		rows:Iterator[tuple] = zip(*hitObjectColumns(self.hitobjects, "type", "starttime", "distance", "repetitions", "endtime"))
+
+		for osu_obj, starttime, distance, repetitions, endtime in rows:
+			# everything that not a slider is worth +1
+			# sliders are another number duh
+			if osu_obj & OSU_OBJ_SPINNER:
+				yield ( osu_obj, starttime, max(starttime, endtime), 1 )
+				continue
 
-				if not CurrentTimingPoint.change and CurrentTimingPoint.ms_per_beat < 0:
-					slider_speed_multiplier = (-100 / CurrentTimingPoint.ms_per_beat)
+			elif not osu_obj & OSU_OBJ_SLIDER:
+				yield ( osu_obj, starttime, starttime, 1 )
+				continue
 
-				px_per_beat = self.slider_multiplier * 100 * slider_speed_multiplier
-				if self.format_version < 8:
-					px_per_beat /= slider_speed_multiplier
+			# slider combo calc, for that we need data from the object itself,
+			# as well data of the timing point active at the start of the slider
+			point:int = Index.find(starttime)
+			px_per_beat:float = Index.px_per_beat[point]
 
 			# get the number of beat
-			beats:float = (Obj.distance * Obj.repetitions) / px_per_beat
+			beats:float = (distance * repetitions) / px_per_beat
 			# get the slider ticks, this is what actully increases the combo
-			ticks:int = math.ceil( (beats - 0.1) / Obj.repetitions * self.slider_tick_rate )
+			ticks:int = math.ceil( (beats - 0.1) / repetitions * self.slider_tick_rate )
 
 			# remove endpoint from ticks
 			ticks -= 1
 			# times the repetition
-			ticks *= Obj.repetitions
+			ticks *= repetitions
 			# add one more repetition and re-add endpoint
-			ticks += Obj.repetitions + 1
+			ticks += repetitions + 1
 
 			# we do this because...
 			# well i really don't know, can there be negative values?
 			# @Francesco149 probly has a reason for this
-			res += max(0, ticks)
+			yield ( osu_obj, starttime, starttime + beats * Index.beat_length[point], max(0, ticks) )
+
+	def getResult(self, kind:str, key:tuple, Mods:object, recalculate:bool) -> object:
+		"""
+			returns the stored result of kind ("Diff", "Stat" or "PP") for key, or None.
+			keys are ( kind, mods value, ... ), with Mods=None the mods value of the last calculated
+			result of kind is used, the rest of key (engine, kwargs) still has to match
+		"""
+		if recalculate: return None
+
+		if Mods is None and kind in self.__last:
+			key = (key[0], self.__last[kind]) + key[2:]
+
+		Result:object = self.__results.get(key)
+		if Result is not None:
+			self.__results.move_to_end(key)
+			self.__last[kind] = key[1]
 
-		return res
+		return Result
+
+	def putResult(self, kind:str, key:tuple, Result:object) -> None:
+		"""
+			stores Result of kind for key, removes the least recently used results above self.max_results
+		"""
+		self.__results[key] = Result
+		self.__results.move_to_end(key)
+		self.__last[kind] = key[1]
+
+		while len(self.__results) > self.max_results:
+			self.__results.popitem(last=False)
 
 	def getDifficulty(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False) -> OsuDifficulty:
-		if self.__Diff and not recalculate: return self.__Diff
+		"""
+			results are stored per mods (see getResult()),
+			Mods=None returns the last calculated difficulty (no mods if there is none)
+		"""
+		mods_value:int = OsuDifficulty.modsValue(Mods)
+		key:tuple = ("Diff", mods_value)
 
-		self.__Diff = OsuDifficulty(self)
-		self.__Diff.applyMods(Mods)
-		return self.__Diff
+		Difficulty:OsuDifficulty = self.getResult("Diff", key, Mods, recalculate)
+		if Difficulty: return Difficulty
 
-	def getStats(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False) -> OsuStats:
-		if self.__Stat and not recalculate: return self.__Stat
+		Difficulty = OsuDifficulty(self)
+		Difficulty.applyMods(mods_value)
+		self.putResult("Diff", key, Difficulty)
+		return Difficulty
+
+	def getStats(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False, engine:str="python", profile:bool=False) -> OsuStats:
+		"""
+			engine is given to OsuStats.calc(), "python" or "numpy"
+			results are stored per mods and engine (see getResult()),
+			Mods=None returns the last calculated stats (no mods if there are none)
+			if the map has a Cache, stored results are used (and new ones stored),
+			they also set the difficulty values, so the cache covers getDifficulty() as well.
+			cached OsuStats have no strains
+			with profile=True, the returned OsuStats has its phase times in .Timings
+		"""
+		key:tuple = ("Stat", OsuDifficulty.modsValue(Mods), engine)
+		Stats:OsuStats = self.getResult("Stat", key, Mods, recalculate)
+		if Stats: return Stats
 
 		# generate diff object, its needed during the calc process
-		self.getDifficulty(Mods=Mods, recalculate=recalculate)
+		Difficulty:OsuDifficulty = self.getDifficulty(Mods=Mods, recalculate=recalculate)
+		key = ("Stat", Difficulty.mods_value, engine)
+
+		if self.Cache is not None:
+			Timings:OsuTimings = OsuTimings() if profile else None
+
+			Stats = self.Cache.getStats(self, Difficulty, engine)
+			if Stats:
+				if Timings is not None: Timings.lap("cache", len(self.hitobjects))
+				Stats.Timings = Timings
+				self.putResult("Stat", key, Stats)
+				return Stats
+
+		Stats = OsuStats(self, Difficulty)
+		Stats.calc(engine=engine, profile=profile)
+
+		if self.Cache is not None:
+			self.Cache.putStats(self, Difficulty, Stats)
 
-		self.__Stat = OsuStats(self)
-		self.__Stat.calc()
-		return self.__Stat
+		self.putResult("Stat", key, Stats)
+		return Stats
 
-	def getPP(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False, **kwargs:dict) -> OsuPP:
+	def getStatsMulti(self, mods_list:list, engine:str="python", singletap_threshold:int=125) -> list:
+		"""
+			calculates the stats for every mod combination in mods_list,
+			returns one OsuStats per entry (same order), each with its own OsuStats.Difficulty
+
+			work that doesn't depend on the mods is shared between all combinations,
+			see OsuStats.calcMany. nothing of this is stored in the map,
+			getDifficulty/getStats/getPP stay untouched
+		"""
+		Difficulties:list = []
+		for Mods in mods_list:
+			Difficulty:OsuDifficulty = OsuDifficulty(self)
+			Difficulty.applyMods(Mods)
+			Difficulties.append(Difficulty)
+
+		return OsuStats.calcMany(self, Difficulties, singletap_threshold=singletap_threshold, engine=engine)
+
+	def getPP(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False, engine:str="python", profile:bool=False, **kwargs:dict) -> OsuPP:
 		"""
 			allowed kwargs:
 				accuracy:float
@@ -394,13 +1068,103 @@ class OsuMap(object):
 				n300:int
 				n100:int
 				n50:int
+
+			results are stored per mods, engine and kwargs (see getResult()),
+			Mods=None returns the last calculated pp (no mods if there are none)
+
+			with profile=True, the returned OsuPP has the times of all phases in .Timings,
+			parsing (if the map was created with profile=True), the stats and the pp
 		"""
-		if self.__PP and not recalculate: return self.__PP
+		key:tuple = self.ppKey(OsuDifficulty.modsValue(Mods), engine, kwargs)
+		PP:OsuPP = self.getResult("PP", key, Mods, recalculate)
+		if PP: return PP
 
 		# to calculate the pp, we need the stats, which needs the applied difficulty
 		# aka, u want pp, u calculate everything
-		self.getStats(Mods=Mods, recalculate=recalculate)
+		Stats:OsuStats = self.getStats(Mods=Mods, recalculate=recalculate, engine=engine, profile=profile)
+
+		PP = OsuPP(self, Stats=Stats)
+		PP.calc(profile=profile, **kwargs)
+
+		if profile:
+			Timings:OsuTimings = OsuTimings()
+			Timings.extend(self.Timings)
+			Timings.extend(Stats.Timings)
+			Timings.extend(PP.Timings)
+			PP.Timings = Timings
+
+		self.putResult("PP", self.ppKey(Stats.Difficulty.mods_value, engine, kwargs), PP)
+		return PP
+
+	@staticmethod
+	def ppKey(mods_value:int, engine:str, kwargs:dict) -> tuple:
+		return ("PP", mods_value, engine, tuple(sorted(kwargs.items())))
+
+	async def agetPP(self, Mods:GeneralOsuMod or list or str=None, recalculate:bool=False, engine:str="python", executor:Executor=None, chunk_size:int=None, **kwargs:dict) -> OsuPP:
+		"""
+			awaitable getPP(), takes the same kwargs.
+			the calculation runs in executor (None = the default executor of the loop),
+			for a ProcessPoolExecutor the map is send to the worker and the results are taken back.
+			with chunk_size, the strains are calculated on the event loop itself
+			and other tasks can run after every chunk_size hit objects (python engine only)
+		"""
+		PP:OsuPP = self.getResult("PP", self.ppKey(OsuDifficulty.modsValue(Mods), engine, kwargs), Mods, recalculate)
+		if PP: return PP
+
+		if not chunk_size:
+			work:functools.partial = functools.partial(calcResults, self, Mods, recalculate, engine, kwargs)
+			Difficulty, Stats, PP = await asyncio.get_running_loop().run_in_executor(executor, work)
+
+			if PP.Map is not self:
+				# calculated on a copy in an other process
+				Difficulty.Map = Stats.Map = PP.Map = self
+				self.putResult("Diff", ("Diff", Difficulty.mods_value), Difficulty)
+				self.putResult("Stat", ("Stat", Difficulty.mods_value, engine), Stats)
+				self.putResult("PP", self.ppKey(Difficulty.mods_value, engine, kwargs), PP)
+
+			return PP
+
+		if engine != "python":
+			raise NotImplementedError("chunk_size only works with the python engine")
+
+		Stats:OsuStats = self.getResult("Stat", ("Stat", OsuDifficulty.modsValue(Mods), engine), Mods, recalculate)
+		if not Stats:
+			Difficulty:OsuDifficulty = self.getDifficulty(Mods=Mods, recalculate=recalculate)
+
+			if self.Cache is not None:
+				Stats = self.Cache.getStats(self, Difficulty, engine)
+
+			if not Stats:
+				Stats = OsuStats(self, Difficulty)
+				await calcStatsChunked(Stats, chunk_size=chunk_size)
+
+				if self.Cache is not None:
+					self.Cache.putStats(self, Difficulty, Stats)
+
+			self.putResult("Stat", ("Stat", Difficulty.mods_value, engine), Stats)
+
+		PP = OsuPP(self, Stats=Stats)
+		PP.calc(**kwargs)
+		self.putResult("PP", self.ppKey(Stats.Difficulty.mods_value, engine, kwargs), PP)
+		return PP
+
+	def getTimeline(self, Mods:GeneralOsuMod or list or str=None, step:int=1, engine:str="python", version:int=1, accuracy:float=100, misses:int=0) -> OsuTimeline:
+		"""
+			stars and pp of the map, if it would end after every step'th hit object,
+			calculated in a single walk over the map, see OsuTimeline.calc()
+			nothing of this is stored in the map
+		"""
+		Difficulty:OsuDifficulty = OsuDifficulty(self)
+		Difficulty.applyMods(Mods)
+
+		return OsuTimeline.calc(self, Difficulty, step=step, engine=engine, version=version, accuracy=accuracy, misses=misses)
+
+	def getPPBatch(self, Mods:GeneralOsuMod or list or str=None, accuracy:list=[100], misses:list=[0], combo:list=[None], version:int=1, recalculate:bool=False, engine:str="python") -> OsuPPTable:
+		"""
+			calculates the pp for every combination of accuracy, misses and combo,
+			see OsuPP.calcMany(). The map is calculated only once (like getPP),
+			returns a OsuPPTable, self.getPP() is not changed
+		"""
+		Stats:OsuStats = self.getStats(Mods=Mods, recalculate=recalculate, engine=engine)
 
-		self.__PP = OsuPP(self)
-		self.__PP.calc(**kwargs)
-		return self.__PP
+		return OsuPP(self, Stats=Stats).calcMany(version=version, accuracy=accuracy, misses=misses, combo=combo)
@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+from .osumap import OsuMap
+from .osuobjectstore import OsuHitObjectStore
+
+# rough memory usage, used for max_bytes
+MAP_BASE_SIZE:int = 4096
+HITOBJECT_SIZE:int = 600
+HITOBJECT_COLUMNAR_SIZE:int = 60
+TIMINGPOINT_SIZE:int = 200
+
+class OsuMapCache(object):
+	"""
+		in-process LRU cache of parsed maps, keyed by ( path, mtime, size, parse options ),
+		so a changed file is parsed again.
+		bounded to max_entries maps and max_bytes (approximately, None for no limit)
+
+		every load() hands out a OsuMap.copy() of the cached map,
+		so calculated results for different mods never clobber each other.
+		maps are always parsed completely, a lazy map would parse its sections again in every copy
+	"""
+	def __init__(self, max_entries:int=128, max_bytes:int=None):
+		self.max_entries:int = max_entries
+		self.max_bytes:int = max_bytes
+
+		self.hits:int = 0
+		self.misses:int = 0
+		self.size:int = 0
+
+		self.__lock:threading.Lock = threading.Lock()
+		self.__maps:OrderedDict = OrderedDict()
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} maps={len(self)} size={self.size} hits={self.hits} misses={self.misses}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return len(self.__maps)
+
+	def load(self, file_path:str, columnar:bool=False) -> OsuMap:
+		"""
+			returns the parsed map of file_path, parses it only if its not cached
+		"""
+		file_path = os.path.abspath(file_path)
+		Stat:os.stat_result = os.stat(file_path)
+		key:tuple = (file_path, Stat.st_mtime_ns, Stat.st_size, columnar)
+
+		with self.__lock:
+			entry:tuple = self.__maps.get(key)
+			if entry:
+				self.__maps.move_to_end(key)
+				self.hits += 1
+				return entry[0].copy()
+
+			self.misses += 1
+
+		# parse outside the lock, so other maps can be loaded meanwhile
+		Map:OsuMap = OsuMap(file_path=file_path, columnar=columnar)
+		size:int = self.approximateSize(Map)
+
+		with self.__lock:
+			if key not in self.__maps:
+				self.__maps[key] = (Map, size)
+				self.size += size
+				self.evict()
+
+		return Map.copy()
+
+	def evict(self) -> None:
+		"""
+			removes the least recently used maps until everything is in bound,
+			must be called with the lock
+		"""
+		while self.__maps and (
+			len(self.__maps) > self.max_entries or
+			(self.max_bytes is not None and self.size > self.max_bytes and len(self.__maps) > 1)
+		):
+			_key, (_Map, size) = self.__maps.popitem(last=False)
+			self.size -= size
+
+	def clear(self) -> None:
+		with self.__lock:
+			self.__maps.clear()
+			self.size = 0
+
+	@staticmethod
+	def approximateSize(Map:OsuMap) -> int:
+		"""
+			rough estimation of the memory a parsed map uses
+		"""
+		size:int = MAP_BASE_SIZE
+		if Map.raw_str:
+			size += len(Map.raw_str)
+		if Map.raw_bytes is not None:
+			size += len(Map.raw_bytes)
+
+		if isinstance(Map.hitobjects, OsuHitObjectStore):
+			size += len(Map.hitobjects) * HITOBJECT_COLUMNAR_SIZE
+		else:
+			size += len(Map.hitobjects) * HITOBJECT_SIZE
+
+		size += len(Map.timingpoints) * TIMINGPOINT_SIZE
+		return size
+
+DefaultMapCache:OsuMapCache = OsuMapCache()
+
+def load(file_path:str, columnar:bool=False) -> OsuMap:
+	"""
+		returns the parsed map of file_path from the DefaultMapCache,
+		change DefaultMapCache.max_entries or .max_bytes to size it
+	"""
+	return DefaultMapCache.load(file_path, columnar=columnar)
@@ -1,4 +1,5 @@
 from .vector import Vector
+from .osuslider import OsuSliderPath, sliderPath
 
 OSU_OBJ_CIRCLE:int = 1<<0
 OSU_OBJ_SLIDER:int = 1<<1
@@ -13,18 +14,12 @@ class OsuHitObject(object):
 		self.osu_obj:int = 0
 		self.starttime:float = float(starttime)
 		self.Pos:Vector = Vector()
-		self.NormPos:Vector = Vector()
-		self.angle:float = 0.0
-		self.strains:list = [0.0, 0.0]
-		self.is_single:bool = False
-		self.delta_time:float = 0.0
-		self.delta_distance:float = 0.0
 
 	def __str__(self):
 		return self.__repr__()
 
 	def __repr__(self):
-		return f"<{self.__class__.__name__} {self.starttime}ms Pos={self.Pos} NormPos={self.NormPos} strains={self.strains} is_single={str(self.is_single)}>"
+		return f"<{self.__class__.__name__} {self.starttime}ms Pos={self.Pos}>"
 
 class OsuHitObjectCircle(OsuHitObject):
 	"""
@@ -40,8 +35,9 @@ class OsuHitObjectCircle(OsuHitObject):
 class OsuHitObjectSlider(OsuHitObject):
 	"""
 		representats a single slider object
+		curve is the curve definition from the map, like "B|100:100|200:50"
 	"""
-	def __init__(self, starttime:float or str, Pos:Vector=None, distance:float or str=0.0, repetitions:int or str=0):
+	def __init__(self, starttime:float or str, Pos:Vector=None, distance:float or str=0.0, repetitions:int or str=0, curve:str=""):
 		super().__init__(starttime)
 		if not Pos: Pos = Vector()
 
@@ -49,6 +45,13 @@ class OsuHitObjectSlider(OsuHitObject):
 		self.Pos = Pos
 		self.distance:float = float(distance)
 		self.repetitions:int = int(repetitions)
+		self.curve:str = curve
+
+	def path(self) -> OsuSliderPath:
+		"""
+			the flat path of the slider, see osuslider.sliderPath()
+		"""
+		return sliderPath(self.curve, self.Pos.x, self.Pos.y, self.distance)
 
 class OsuHitObjectSpinner(OsuHitObject):
 	"""
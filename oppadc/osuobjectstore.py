@@ -0,0 +1,151 @@
+from typing import Iterator
+from array import array
+
+from .vector import Vector
+from .osuobject import (
+	OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER, OSU_OBJ_SPINNER,
+	OsuHitObject, OsuHitObjectCircle, OsuHitObjectSlider, OsuHitObjectSpinner
+)
+
+# how every column is read from a hit object, see hitObjectColumns()
+OBJECT_COLUMNS:dict = {
+	"starttime": lambda Obj: Obj.starttime,
+	"x": lambda Obj: Obj.Pos.x,
+	"y": lambda Obj: Obj.Pos.y,
+	"type": lambda Obj: Obj.osu_obj,
+	"repetitions": lambda Obj: getattr(Obj, "repetitions", 0),
+	"distance": lambda Obj: getattr(Obj, "distance", 0.0),
+	"endtime": lambda Obj: getattr(Obj, "endtime", 0.0),
+	"curve": lambda Obj: getattr(Obj, "curve", ""),
+}
+
+class OsuHitObjectStore(object):
+	"""
+		columnar storage for hit objects,
+		every value is hold in a parallel typed array instead of a python object per hit object.
+		index, iterate or slice it like the normal list of OsuMap.hitobjects,
+		the objects are only created (and then kept) when they are accessed that way
+
+		type contains the osu_obj value (OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER, OSU_OBJ_SPINNER)
+		curve is a plain list of the slider curve definitions ("" for everything else)
+	"""
+	def __init__(self):
+		self.starttime:array = array('d')
+		self.x:array = array('d')
+		self.y:array = array('d')
+		self.type:array = array('B')
+		self.repetitions:array = array('i')
+		self.distance:array = array('d')
+		self.endtime:array = array('d')
+		self.curve:list = []
+
+		self.__objects:list = []
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} objects={len(self)} materialized={self.amountMaterialized()}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return len(self.starttime)
+
+	def __bool__(self) -> bool:
+		return len(self.starttime) > 0
+
+	def __iter__(self) -> Iterator[OsuHitObject]:
+		for i in range(len(self)):
+			yield self.materialize(i)
+
+	def __getitem__(self, index:int or slice) -> OsuHitObject or list:
+		if type(index) is slice:
+			return [self.materialize(i) for i in range(len(self))[index]]
+
+		if index < 0:
+			index += len(self)
+
+		if not (0 <= index < len(self)):
+			raise IndexError("hit object index out of range")
+
+		return self.materialize(index)
+
+	@classmethod
+	def fromObjects(cls, objects:list) -> "OsuHitObjectStore":
+		"""
+			build a store from a list of hit objects,
+			the given objects are kept, so nothing needs to be materialized later
+		"""
+		Store:OsuHitObjectStore = cls()
+		for Obj in objects:
+			Store.append(
+				Obj.starttime, Obj.Pos.x, Obj.Pos.y, Obj.osu_obj,
+				repetitions=getattr(Obj, "repetitions", 0),
+				distance=getattr(Obj, "distance", 0.0),
+				endtime=getattr(Obj, "endtime", 0.0),
+				curve=getattr(Obj, "curve", "")
+			)
+		Store.__objects = list(objects)
+		return Store
+
+	def append(self, starttime:float, x:float, y:float, objtype:int, repetitions:int=0, distance:float=0.0, endtime:float=0.0, curve:str="") -> None:
+		self.starttime.append(starttime)
+		self.x.append(x)
+		self.y.append(y)
+		self.type.append(objtype)
+		self.repetitions.append(repetitions)
+		self.distance.append(distance)
+		self.endtime.append(endtime)
+		self.curve.append(curve)
+
+	def materialize(self, index:int) -> OsuHitObject:
+		"""
+			returns the hit object for index, creates it on first access
+		"""
+		if len(self.__objects) < len(self):
+			self.__objects.extend( [None] * (len(self) - len(self.__objects)) )
+
+		Obj:OsuHitObject = self.__objects[index]
+		if Obj is not None: return Obj
+
+		objtype:int = self.type[index]
+		starttime:float = self.starttime[index]
+
+		if objtype & OSU_OBJ_CIRCLE:
+			Obj = OsuHitObjectCircle(starttime, Pos=Vector(self.x[index], self.y[index]))
+
+		elif objtype & OSU_OBJ_SLIDER:
+			Obj = OsuHitObjectSlider(starttime, Pos=Vector(self.x[index], self.y[index]), distance=self.distance[index], repetitions=self.repetitions[index], curve=self.curve[index])
+
+		elif objtype & OSU_OBJ_SPINNER:
+			Obj = OsuHitObjectSpinner(starttime, endtime=self.endtime[index])
+
+		else:
+			raise SyntaxError("invalid hitobject type")
+
+		self.__objects[index] = Obj
+		return Obj
+
+	def columns(self, *names:str) -> tuple:
+		"""
+			the arrays of the columns names (like "starttime", "x", "type"), nothing is copied or materialized
+		"""
+		return tuple( getattr(self, name) for name in names )
+
+	def amountMaterialized(self) -> int:
+		return sum(1 for Obj in self.__objects if Obj is not None)
+
+	def release(self) -> None:
+		"""
+			drop all materialized objects (and everything calculated on them)
+		"""
+		self.__objects = []
+
+def hitObjectColumns(hitobjects:list or OsuHitObjectStore, *names:str) -> tuple:
+	"""
+		the columns names (see OBJECT_COLUMNS) of hitobjects (OsuMap.hitobjects),
+		a OsuHitObjectStore gives its arrays directly, a list of objects is read into lists
+	"""
+	if isinstance(hitobjects, OsuHitObjectStore):
+		return hitobjects.columns(*names)
+
+	return tuple( [ OBJECT_COLUMNS[name](Obj) for Obj in hitobjects ] for name in names )
@@ -1,11 +1,13 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator, Callable
 if TYPE_CHECKING:
 	from .osumap import OsuMap
 
 import math
+from array import array
 from .osumod import OsuModIndex
 from .osustats import OsuStats
 from .osudifficulty import OsuDifficulty
+from .osuprofile import OsuTimings
 from .osugamemode import MODE_STD
 
 MOD_HD:int = OsuModIndex.getValueFromString("HD")
@@ -17,8 +19,9 @@ class OsuPP(object):
 	"""
 		Holds all methods to get the wanted pp values
 	"""
-	def __init__(self, Map:"OsuMap"):
+	def __init__(self, Map:"OsuMap", Stats:OsuStats=None):
 		self.Map:"OsuMap" = Map
+		self.Stats:OsuStats = Stats # None = Map.getStats()
 
 		self.accuracy:float = 0.0
 		self.combo:int = 0
@@ -28,6 +31,7 @@ class OsuPP(object):
 		self.aim_pp:float = 0.0
 		self.speed_pp:float = 0.0
 		self.acc_pp:float = 0.0
+		self.Timings:OsuTimings = None
 
 	def __str__(self):
 		return self.__repr__()
@@ -35,7 +39,7 @@ class OsuPP(object):
 	def __repr__(self):
 		return f"<{self.__class__.__name__} total={round(self.total_pp,3)}pp (aim={round(self.aim_pp,2)} speed={round(self.speed_pp,2)} acc={round(self.acc_pp,2)}) [{round(self.accuracy,2)}%]>"
 
-	def calc(self, version:int=1, accuracy:float=100, combo:int=None, misses:int=0, n300:int=None, n100:int=None, n50:int=None) -> None:
+	def calc(self, version:int=1, accuracy:float=100, combo:int=None, misses:int=0, n300:int=None, n100:int=None, n50:int=None, profile:bool=False) -> None:
 		"""
 			calculates the total pp (by standard PPv2) with the called arguments
 			if its not given its always assumed to be the highest/best.
@@ -44,35 +48,66 @@ class OsuPP(object):
 			but it can be calculated back to these from value
 
 			If you provide both, (n300, n100, n50) are taken
+
+			with profile=True, the time of every phase is recorded in self.Timings (OsuTimings)
+		"""
+		self.Timings = OsuTimings() if profile else None
+
+		Values:OsuPPMapValues = OsuPPMapValues(self, version)
+		if self.Timings is not None: self.Timings.lap("pp_values", Values.amount_hitobjects)
+
+		result:tuple = self.calcPoint(Values, accuracy, combo, misses, n300, n100, n50)
+		if self.Timings is not None: self.Timings.lap("pp_formula", Values.amount_hitobjects)
+
+		# set the vars we calculated with
+		self.accuracy, self.combo, self.misses = result[0:3]
+		self.total_pp, self.aim_pp, self.speed_pp, self.acc_pp = result[6:10]
+
+	def calcMany(self, version:int=1, accuracy:list=[100], misses:list=[0], combo:list=[None]) -> "OsuPPTable":
+		"""
+			calculates the pp for every combination of accuracy, misses and combo
+			(accuracy is the outer, combo the inner loop)
+
+			everything that only depends on the map is calculated once,
+			each point is calculated exactly like calc() would do it.
+			self.* is not changed
+		"""
+		Values:OsuPPMapValues = OsuPPMapValues(self, version)
+		Table:OsuPPTable = OsuPPTable()
+
+		for acc in accuracy:
+			for miss in misses:
+				for com in combo:
+					Table.append( self.calcPoint(Values, acc, com, miss) )
+
+		return Table
+
+	def calcPoint(self, Values:"OsuPPMapValues", accuracy:float=100, combo:int=None, misses:int=0, n300:int=None, n100:int=None, n50:int=None) -> tuple:
+		"""
+			calculates a single point with the map values from OsuPPMapValues
+			returns ( accuracy, combo, misses, n300, n100, n50, total_pp, aim_pp, speed_pp, acc_pp )
 		"""
 
 		# we don't got all values from the user, so let calculate back from acc
 		if not (n300 != None and n100 != None and n50 != None):
-			n300, n100, n50 = self.getValuesFromAcc(accuracy, misses)
+			n300, n100, n50 = self.getValuesFromAcc(accuracy, misses, amount_hitobjects=Values.amount_hitobjects)
 
 		# got no combo values, so we assume max combo
-		max_combo:int = self.Map.maxCombo()
+		max_combo:int = Values.max_combo
 		if not combo or combo < 0:
 			combo = max_combo - misses
 
-		Stats:OsuStats = self.Map.getStats()
-		Difficulty:OsuDifficulty = self.Map.getDifficulty()
-
-		if self.Map.mode != MODE_STD and version == 2:
-			raise NotImplementedError("no need to ppV2")
+		amount_hitobjects:int = Values.amount_hitobjects
 
 		# re-calc accuracy
-		amount_hitobjects:int = len(self.Map.hitobjects)
-		amount_circle:int = self.Map.amount_circle
-
 		accuracy = self.getAccFromValues(n300, n100, n50, misses)
 		real_acc:float = accuracy
 
-		if version == 1:
+		if Values.version == 1:
 			# scorev1 ignores sliders since they are free 300s,
 			# for whatever reason it also ignores spinners
 			real_acc = self.getAccFromValues(
-				(n300 - self.Map.amount_slider - self.Map.amount_spinner),
+				(n300 - Values.amount_slider - Values.amount_spinner),
 				n100,
 				n50,
 				misses
@@ -81,123 +116,135 @@ class OsuPP(object):
 			# can go negative if we miss everything
 			real_acc = max(0.0, real_acc)
 
-		elif version == 2:
-			amount_circle = amount_hitobjects
-
-		else:
-			raise NotImplementedError(f"unknown score version: {version}")
-
-		# global vars
-		amount_hitobjects:int = len(self.Map.hitobjects)
-		amount_objects_ober_2k:float = amount_hitobjects / 2000
-		length_bonus:float = 0.95 + (0.4 * min(1, amount_objects_ober_2k))
-
-		if amount_hitobjects > 2000:
-			length_bonus += math.log10(amount_objects_ober_2k) * 0.5
-
 		miss_penality_aim:float = 0.97 * pow(1 - pow(misses / amount_hitobjects, 0.775), misses)
 		miss_penality_speed:float = 0.97 * pow(1 - pow(misses / amount_hitobjects, 0.775), pow(misses, 0.875))
 		combo_break:float = (combo**0.8) / (max_combo**0.8)
 
-		# ar bonus
-		ar_bonus:float = 0.0
-		if Difficulty.ar > 10.33:
-			ar_bonus += 0.4 * (Difficulty.ar - 10.33)
-
-		elif Difficulty.ar < 8.0:
-			ar_bonus += 0.1 * (8.0 - Difficulty.ar)
-
 		# aim pp - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-		self.aim_pp = self.getBasePP(Stats.aim)
-		self.aim_pp *= length_bonus
+		aim_pp:float = Values.aim_base
 		if misses > 0:
-			self.aim_pp *= miss_penality_aim
-		self.aim_pp *= combo_break
-		self.aim_pp *= (1 + min(ar_bonus, ar_bonus * (amount_hitobjects / 1000)))
+			aim_pp *= miss_penality_aim
+		aim_pp *= combo_break
+		aim_pp *= Values.ar_factor
 
 		# hd bonus
-		hd_bonus:float = 1.0
-		if Difficulty.mods_value & MOD_HD:
-			hd_bonus += (0.04 * (12 - Difficulty.ar))
-			self.aim_pp *= hd_bonus
+		if Values.mods_value & MOD_HD:
+			aim_pp *= Values.hd_bonus
 
 		# fl bonus
-		if Difficulty.mods_value & MOD_FL:
-			fl_bonus:float = 1 + (0.35 * min(1, amount_hitobjects/200))
-
-			if amount_hitobjects > 200:
-				fl_bonus += 0.3 * min(1, ((amount_hitobjects-200)/300) )
-
-			if amount_hitobjects > 500:
-				fl_bonus += (amount_hitobjects-500) / 1200
-
-			self.aim_pp *= fl_bonus
+		if Values.mods_value & MOD_FL:
+			aim_pp *= Values.fl_bonus
 
 		# acc and od bonus
 		acc_bonus:float = 0.5 + (accuracy / 2)
-		od_squared = Difficulty.od * Difficulty.od
-		od_bonus:float = 0.98 + (od_squared / 2500)
 
-		self.aim_pp *= acc_bonus
-		self.aim_pp *= od_bonus
+		aim_pp *= acc_bonus
+		aim_pp *= Values.od_bonus
 
 		# speed pp - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-		self.speed_pp = self.getBasePP(Stats.speed)
-		self.speed_pp *= length_bonus
+		speed_pp:float = Values.speed_base
 		if misses > 0:
-			self.speed_pp *= miss_penality_speed
-		self.speed_pp *= combo_break
+			speed_pp *= miss_penality_speed
+		speed_pp *= combo_break
 
 		# high ar bonus
-		if Difficulty.ar > 10.33:
-			self.speed_pp *= 1 + min(ar_bonus, ar_bonus * (amount_hitobjects / 1000))
+		if Values.ar > 10.33:
+			speed_pp *= Values.ar_factor
 
 		# hd bonus
-		self.speed_pp *= hd_bonus
+		speed_pp *= Values.hd_bonus
 
 		# more stuff added
-		self.speed_pp *= (0.95 + od_squared / 750)
-		self.speed_pp *= accuracy ** ((14.5 - max(Difficulty.od, 8)) / 2)
+		speed_pp *= Values.speed_od_bonus
+		speed_pp *= accuracy ** Values.speed_acc_exponent
 		if n50 >= amount_hitobjects / 500:
-			self.speed_pp *= 0.98 ** (n50 - amount_hitobjects / 500)
+			speed_pp *= 0.98 ** (n50 - amount_hitobjects / 500)
 
 		# acc pp - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-		self.acc_pp = (1.52163 ** Difficulty.od) * (real_acc ** 24) * 2.83
+		acc_pp:float = Values.acc_od_base * (real_acc ** 24) * 2.83
 
 		# length bonus (not the same as speed/aim length bonus)
-		self.acc_pp *= min(1.15, ((amount_circle/1000) ** 0.3))
+		acc_pp *= Values.acc_length_bonus
 
-		if Difficulty.mods_value & MOD_HD:
-			self.acc_pp *= 1.08
+		if Values.mods_value & MOD_HD:
+			acc_pp *= 1.08
 
-		if Difficulty.mods_value & MOD_FL:
-			self.acc_pp *= 1.02
+		if Values.mods_value & MOD_FL:
+			acc_pp *= 1.02
 
 		# total pp - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 		final_multiplier:float = 1.12
 
-		if Difficulty.mods_value & MOD_NF:
+		if Values.mods_value & MOD_NF:
 			final_multiplier *= max(0.9, 1 - 0.2 * misses)
 
-		if Difficulty.mods_value & MOD_SO:
-			final_multiplier *= 1 - (self.Map.amount_spinner / amount_hitobjects) ** 0.85
+		if Values.mods_value & MOD_SO:
+			final_multiplier *= Values.so_factor
 
-		self.total_pp = (( (self.aim_pp**1.1) + (self.speed_pp**1.1) + (self.acc_pp**1.1) ) ** (1.0/1.1)) * final_multiplier
-		# set the vars we calculated with
-		self.accuracy = accuracy * 100
-		self.combo = combo
-		self.misses = misses
+		total_pp:float = (( (aim_pp**1.1) + (speed_pp**1.1) + (acc_pp**1.1) ) ** (1.0/1.1)) * final_multiplier
+
+		return ( accuracy * 100, combo, misses, n300, n100, n50, total_pp, aim_pp, speed_pp, acc_pp )
+
+	# inverse solvers, they expect the pp to only go up with accuracy and combo and down with misses
+	def solveAccuracy(self, target_pp:float, version:int=1, misses:int=0, combo:int=None, precision:float=0.001) -> tuple:
+		"""
+			lowest accuracy (in steps of precision %) that is worth at least target_pp,
+			returns the point of it (like calcPoint()) or None if even 100% is not enough.
+			for other mods use OsuPP(Map, Stats=Map.getStats(Mods)), self.* is not changed
+		"""
+		Values:OsuPPMapValues = OsuPPMapValues(self, version)
+		probe:Callable = lambda acc: self.calcPoint(Values, acc, combo, misses)
+
+		lo:float = 0.0
+		hi:float = 100.0
+		point:tuple = probe(hi)
+		if point[6] < target_pp: return None
+
+		lowest:tuple = probe(lo)
+		if lowest[6] >= target_pp: return lowest
+
+		while (hi - lo) > precision:
+			middle:float = (lo + hi) / 2
+			probed:tuple = probe(middle)
+			if probed[6] >= target_pp:
+				hi, point = middle, probed
+			else:
+				lo = middle
+
+		return point
+
+	def solveMisses(self, target_pp:float, version:int=1, accuracy:float=100, combo:int=None) -> tuple:
+		"""
+			most misses that are still worth at least target_pp,
+			returns the point of it (like calcPoint()) or None if even 0 misses are not enough
+		"""
+		Values:OsuPPMapValues = OsuPPMapValues(self, version)
+		probe:Callable = lambda misses: self.calcPoint(Values, accuracy, combo, misses)
+
+		return bisectMax(probe, 0, Values.amount_hitobjects, target_pp)
+
+	def solveCombo(self, target_pp:float, version:int=1, accuracy:float=100, misses:int=0) -> tuple:
+		"""
+			lowest combo that is worth at least target_pp,
+			returns the point of it (like calcPoint()) or None if even the max combo is not enough
+		"""
+		Values:OsuPPMapValues = OsuPPMapValues(self, version)
+		probe:Callable = lambda combo: self.calcPoint(Values, accuracy, combo, misses)
+
+		return bisectMin(probe, 1, max(1, Values.max_combo - misses), target_pp)
 
 	def getBasePP(self, stars:float) -> float:
 		return (((5 * max( 1, (stars / 0.0675) )) - 4) ** 3) / 100000
 
-	def getValuesFromAcc(self, accuracy:float, misses:float) -> tuple:
+	def getValuesFromAcc(self, accuracy:float, misses:float, amount_hitobjects:int=None) -> tuple:
 		"""
 			tryed to get to the closest amount of n300, n100, n50
 			based of the accuracy and misses
+			amount_hitobjects defaults to all hit objects of the map
 		"""
 
-		amount_hitobjects:int = len(self.Map.hitobjects)
+		if amount_hitobjects is None:
+			amount_hitobjects = len(self.Map.hitobjects)
 
 		misses = min(amount_hitobjects, misses)
 		max_n300:float = amount_hitobjects - misses
@@ -233,3 +280,178 @@ class OsuPP(object):
 		if total <= 0: return 0.0
 
 		return ((n50 * 50) + (n100 * 100) + (n300 * 300)) / (total * 300)
+
+def bisectMin(probe:Callable, lo:int, hi:int, target_pp:float) -> tuple:
+	"""
+		point of the lowest value in [lo, hi] where probe(value) reaches target_pp (total_pp),
+		for probes that only go up. None if hi doesn't reach it
+	"""
+	point:tuple = probe(hi)
+	if point[6] < target_pp: return None
+
+	while lo < hi:
+		middle:int = (lo + hi) // 2
+		probed:tuple = probe(middle)
+		if probed[6] >= target_pp:
+			hi, point = middle, probed
+		else:
+			lo = middle + 1
+
+	return point
+
+def bisectMax(probe:Callable, lo:int, hi:int, target_pp:float) -> tuple:
+	"""
+		point of the highest value in [lo, hi] where probe(value) reaches target_pp (total_pp),
+		for probes that only go down. None if lo doesn't reach it
+	"""
+	point:tuple = probe(lo)
+	if point[6] < target_pp: return None
+
+	while lo < hi:
+		middle:int = (lo + hi + 1) // 2
+		probed:tuple = probe(middle)
+		if probed[6] >= target_pp:
+			lo, point = middle, probed
+		else:
+			hi = middle - 1
+
+	return point
+
+class OsuPPMapValues(object):
+	"""
+		everything of the pp calculation that only depends on the map (and its mods)
+		and not on accuracy, combo or misses
+
+		by default everything is taken from the map (getStats, getDifficulty, maxCombo, amount_*),
+		or from Stats.map_values for cached stats.
+		give Stats, Difficulty, the amounts and max_combo to calculate something else,
+		like only a part of the map
+	"""
+	def __init__(self, PP:OsuPP, version:int=1, Stats:OsuStats=None, Difficulty:OsuDifficulty=None, amount_circle:int=None, amount_slider:int=None, amount_spinner:int=None, max_combo:int=None):
+		Map:"OsuMap" = PP.Map
+		Stats = Stats or PP.Stats or Map.getStats()
+		Difficulty = Difficulty or Stats.Difficulty or Map.getDifficulty()
+
+		if Map.mode != MODE_STD and version == 2:
+			raise NotImplementedError("no need to ppV2")
+
+		if version not in (1, 2):
+			raise NotImplementedError(f"unknown score version: {version}")
+
+		self.version:int = version
+		self.mods_value:int = Difficulty.mods_value
+		self.ar:float = Difficulty.ar
+
+		# cached stats know the map values, so the hit objects are not needed
+		if Stats.map_values is not None and max_combo is None and amount_circle is None:
+			max_combo = Stats.map_values["max_combo"]
+			amount_circle = Stats.map_values["amount_circle"]
+			amount_slider = Stats.map_values["amount_slider"]
+			amount_spinner = Stats.map_values["amount_spinner"]
+
+		self.max_combo:int = Map.maxCombo() if max_combo is None else max_combo
+
+		# global vars
+		amount_hitobjects:int
+		if amount_circle is not None:
+			amount_hitobjects = amount_circle + amount_slider + amount_spinner
+		else:
+			amount_hitobjects = len(Map.hitobjects)
+			amount_circle, amount_slider, amount_spinner = Map.amount_circle, Map.amount_slider, Map.amount_spinner
+
+		self.amount_hitobjects:int = amount_hitobjects
+		self.amount_slider:int = amount_slider
+		self.amount_spinner:int = amount_spinner
+
+		if version == 2:
+			amount_circle = amount_hitobjects
+
+		amount_objects_ober_2k:float = amount_hitobjects / 2000
+		length_bonus:float = 0.95 + (0.4 * min(1, amount_objects_ober_2k))
+
+		if amount_hitobjects > 2000:
+			length_bonus += math.log10(amount_objects_ober_2k) * 0.5
+
+		# ar bonus
+		ar_bonus:float = 0.0
+		if Difficulty.ar > 10.33:
+			ar_bonus += 0.4 * (Difficulty.ar - 10.33)
+
+		elif Difficulty.ar < 8.0:
+			ar_bonus += 0.1 * (8.0 - Difficulty.ar)
+
+		self.ar_factor:float = (1 + min(ar_bonus, ar_bonus * (amount_hitobjects / 1000)))
+
+		# aim
+		self.aim_base:float = PP.getBasePP(Stats.aim)
+		self.aim_base *= length_bonus
+
+		# hd bonus
+		self.hd_bonus:float = 1.0
+		if Difficulty.mods_value & MOD_HD:
+			self.hd_bonus += (0.04 * (12 - Difficulty.ar))
+
+		# fl bonus
+		self.fl_bonus:float = 1 + (0.35 * min(1, amount_hitobjects/200))
+
+		if amount_hitobjects > 200:
+			self.fl_bonus += 0.3 * min(1, ((amount_hitobjects-200)/300) )
+
+		if amount_hitobjects > 500:
+			self.fl_bonus += (amount_hitobjects-500) / 1200
+
+		# od bonus
+		od_squared = Difficulty.od * Difficulty.od
+		self.od_bonus:float = 0.98 + (od_squared / 2500)
+
+		# speed
+		self.speed_base:float = PP.getBasePP(Stats.speed)
+		self.speed_base *= length_bonus
+		self.speed_od_bonus:float = (0.95 + od_squared / 750)
+		self.speed_acc_exponent:float = ((14.5 - max(Difficulty.od, 8)) / 2)
+
+		# acc
+		self.acc_od_base:float = (1.52163 ** Difficulty.od)
+		self.acc_length_bonus:float = min(1.15, ((amount_circle/1000) ** 0.3))
+
+		# spun out
+		self.so_factor:float = 1 - (amount_spinner / amount_hitobjects) ** 0.85
+
+class OsuPPTable(object):
+	"""
+		compact result of OsuPP.calcMany(), one typed array per column
+		iterating gives a dict per point
+	"""
+	COLUMNS:tuple = ("accuracy", "combo", "misses", "n300", "n100", "n50", "total_pp", "aim_pp", "speed_pp", "acc_pp")
+
+	def __init__(self):
+		self.accuracy:array = array('d')
+		self.combo:array = array('i')
+		self.misses:array = array('i')
+		self.n300:array = array('i')
+		self.n100:array = array('i')
+		self.n50:array = array('i')
+		self.total_pp:array = array('d')
+		self.aim_pp:array = array('d')
+		self.speed_pp:array = array('d')
+		self.acc_pp:array = array('d')
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} points={len(self)}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return len(self.total_pp)
+
+	def __getitem__(self, index:int) -> dict:
+		return { column: getattr(self, column)[index] for column in self.COLUMNS }
+
+	def __iter__(self) -> Iterator[dict]:
+		for i in range(len(self)):
+			yield self[i]
+
+	def append(self, point:tuple) -> None:
+		for column, value in zip(self.COLUMNS, point):
+			getattr(self, column).append(value)
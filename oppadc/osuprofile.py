@@ -0,0 +1,57 @@
+import time
+from typing import Iterator
+
+class OsuTimings(object):
+	"""
+		per phase timing record of a calculation, filled when profile=True is given
+		(OsuMap(profile=True), getStats/getPP(profile=True), OsuStats.calc/OsuPP.calc(profile=True))
+
+		every phase has its wall time in seconds, the amount of hit objects it worked on
+		and the amount of strain sections (None if the phase has no sections)
+	"""
+	def __init__(self):
+		self.phases:list = []
+		self.__last:float = time.perf_counter()
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} phases={len(self)} total={round(self.total * 1000, 3)}ms>"
+
+	def __str__(self) -> str:
+		lines:list = []
+		for phase in self:
+			sections:str = "" if phase["sections"] is None else f" {phase['sections']} sections"
+			lines.append( f"{phase['phase']:<16} {round(phase['seconds'] * 1000, 3):>10}ms  {phase['objects']} objects{sections}" )
+
+		lines.append( f"{'total':<16} {round(self.total * 1000, 3):>10}ms" )
+		return "\n".join(lines)
+
+	def __len__(self) -> int:
+		return len(self.phases)
+
+	def __iter__(self) -> Iterator[dict]:
+		return iter(self.phases)
+
+	@property
+	def total(self) -> float:
+		return sum(phase["seconds"] for phase in self.phases)
+
+	def start(self) -> None:
+		"""
+			the next phase starts now
+		"""
+		self.__last = time.perf_counter()
+
+	def lap(self, phase:str, objects:int, sections:int=None) -> None:
+		"""
+			records phase, from the last start() or lap() until now
+		"""
+		now:float = time.perf_counter()
+		self.phases.append( dict(phase=phase, seconds=now - self.__last, objects=objects, sections=sections) )
+		self.__last = now
+
+	def extend(self, Other:"OsuTimings") -> None:
+		"""
+			adds all phases of Other (if there is one)
+		"""
+		if Other is not None:
+			self.phases.extend(Other.phases)
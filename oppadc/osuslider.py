@@ -0,0 +1,301 @@
+"""
+	slider paths, turns the curve of a slider (like "B|100:100|200:50") into a flat list of points
+
+	curve types:
+		L: linear, straight lines between the points
+		P: perfect circle, an arc through 3 points (falls back to bezier if its not possible)
+		B: bezier, a repeated point splits it into multiple bezier curves
+		C: catmull-rom spline
+
+	the flat path is cut (or extended in the direction of its last segment) to the slider distance,
+	like osu! does it. sliderPath() is memoized by the curve definition,
+	so the same slider (in the same or an other map) is only flattened once
+"""
+import math
+import bisect
+import functools
+from array import array
+from .vector import Vector
+
+CURVE_LINEAR:str = "L"
+CURVE_PERFECT:str = "P"
+CURVE_BEZIER:str = "B"
+CURVE_CATMULL:str = "C"
+
+BEZIER_TOLERANCE:float = 0.25 # max distance (in osu!pixels) between the bezier curve and the flat path
+CIRCLE_TOLERANCE:float = 0.1
+CATMULL_DETAIL:int = 50 # points per catmull segment
+SLIDER_PATH_CACHE_SIZE:int = 4096
+
+class OsuSliderPath(object):
+	"""
+		flat path of a slider, positions are in osu!pixels
+		lengths[i] is the distance along the path from the head to point i
+	"""
+	def __init__(self, curve_type:str, control_points:tuple, x:array, y:array, lengths:array):
+		self.curve_type:str = curve_type
+		self.control_points:tuple = control_points
+		self.x:array = x
+		self.y:array = y
+		self.lengths:array = lengths
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} type={self.curve_type} points={len(self)} length={round(self.length, 2)}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return len(self.x)
+
+	@property
+	def length(self) -> float:
+		return self.lengths[-1] if self.lengths else 0.0
+
+	def positionAt(self, progress:float) -> Vector:
+		"""
+			position after progress (0.0 = head, 1.0 = tail) of the path
+		"""
+		if len(self.x) < 2:
+			return Vector(self.x[0], self.y[0]) if self.x else Vector()
+
+		distance:float = min(max(progress, 0.0), 1.0) * self.length
+		i:int = max(1, min(bisect.bisect_left(self.lengths, distance), len(self.x) - 1))
+
+		segment:float = self.lengths[i] - self.lengths[i - 1]
+		t:float = (distance - self.lengths[i - 1]) / segment if segment else 0.0
+
+		return Vector(
+			self.x[i - 1] + (self.x[i] - self.x[i - 1]) * t,
+			self.y[i - 1] + (self.y[i] - self.y[i - 1]) * t
+		)
+
+	def endPosition(self, repetitions:int=1) -> Vector:
+		"""
+			where the slider ends, the head for an even amount of repetitions
+		"""
+		return self.positionAt(1.0 if repetitions % 2 else 0.0)
+
+@functools.lru_cache(maxsize=SLIDER_PATH_CACHE_SIZE)
+def sliderPath(curve:str, x:float, y:float, distance:float) -> OsuSliderPath:
+	"""
+		the OsuSliderPath of a slider, from its curve definition (like "B|100:100|200:50"),
+		head position and distance. memoized, so don't change the returned path
+	"""
+	curve_type, points = parseCurve(curve, x, y)
+
+	flat:list
+	if len(points) < 2:
+		flat = list(points)
+	elif curve_type == CURVE_LINEAR:
+		flat = list(points)
+	elif curve_type == CURVE_PERFECT and len(points) == 3:
+		flat = flattenPerfect(points)
+	elif curve_type == CURVE_CATMULL:
+		flat = flattenCatmull(points)
+	else:
+		flat = []
+		for segment in bezierSegments(points):
+			part:list = flattenBezier(segment)
+			flat.extend(part[1:] if flat else part)
+
+	xs, ys, lengths = cutPath(flat, distance)
+	return OsuSliderPath(curve_type, tuple(points), xs, ys, lengths)
+
+def parseCurve(curve:str, x:float, y:float) -> tuple:
+	"""
+		returns ( curve type, control points as ( x, y ) with the head first )
+	"""
+	points:list = [ (float(x), float(y)) ]
+	curve_type:str = CURVE_BEZIER
+
+	for part in curve.split("|"):
+		if not part: continue
+
+		if ":" not in part:
+			curve_type = part
+			continue
+
+		px, py = part.split(":", 1)
+		points.append( (float(px), float(py)) )
+
+	return ( curve_type, points )
+
+# curves
+def bezierSegments(points:list) -> list:
+	"""
+		a point that is repeated (red anchor) ends a bezier curve and starts the next one
+	"""
+	segments:list = []
+	current:list = [ points[0] ]
+	for point in points[1:]:
+		if point == current[-1]:
+			if len(current) > 1: segments.append(current)
+			current = [point]
+		else:
+			current.append(point)
+
+	if len(current) > 1:
+		segments.append(current)
+
+	return segments
+
+def flattenBezier(points:list) -> list:
+	"""
+		flat points of a bezier curve, by subdividing it until every part is flat enough
+	"""
+	if len(points) < 3:
+		return list(points)
+
+	flat:list = [ points[0] ]
+	stack:list = [ points ]
+	while stack:
+		current:list = stack.pop()
+		if bezierIsFlat(current):
+			flat.append(current[-1])
+			continue
+
+		left, right = bezierSubdivide(current)
+		stack.append(right)
+		stack.append(left)
+
+	return flat
+
+def bezierIsFlat(points:list) -> bool:
+	limit:float = (BEZIER_TOLERANCE * BEZIER_TOLERANCE) * 4
+	for i in range(1, len(points) - 1):
+		dx:float = points[i - 1][0] - 2 * points[i][0] + points[i + 1][0]
+		dy:float = points[i - 1][1] - 2 * points[i][1] + points[i + 1][1]
+		if (dx * dx) + (dy * dy) > limit:
+			return False
+
+	return True
+
+def bezierSubdivide(points:list) -> tuple:
+	"""
+		splits a bezier curve in the middle (de Casteljau), returns ( left points, right points )
+	"""
+	left:list = [ points[0] ]
+	right:list = [ points[-1] ]
+	current:list = points
+	while len(current) > 1:
+		current = [
+			( (current[i][0] + current[i + 1][0]) / 2, (current[i][1] + current[i + 1][1]) / 2 )
+			for i in range(len(current) - 1)
+		]
+		left.append(current[0])
+		right.append(current[-1])
+
+	right.reverse()
+	return ( left, right )
+
+def flattenPerfect(points:list) -> list:
+	"""
+		flat points of the circle arc through 3 points, bezier if they are on one line
+	"""
+	(ax, ay), (bx, by), (cx, cy) = points
+	d:float = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+	if abs(d) < 1e-6:
+		return flattenBezier(points)
+
+	a_sq:float = ax * ax + ay * ay
+	b_sq:float = bx * bx + by * by
+	c_sq:float = cx * cx + cy * cy
+	center_x:float = (a_sq * (by - cy) + b_sq * (cy - ay) + c_sq * (ay - by)) / d
+	center_y:float = (a_sq * (cx - bx) + b_sq * (ax - cx) + c_sq * (bx - ax)) / d
+	radius:float = math.hypot(ax - center_x, ay - center_y)
+
+	theta_start:float = math.atan2(ay - center_y, ax - center_x)
+	theta_end:float = math.atan2(cy - center_y, cx - center_x)
+	while theta_end < theta_start:
+		theta_end += 2 * math.pi
+
+	direction:int = 1
+	theta_range:float = theta_end - theta_start
+
+	# the arc has to go through b, otherwise its the other way around
+	if (cx - ax) * (by - ay) - (cy - ay) * (bx - ax) > 0:
+		direction = -1
+		theta_range = 2 * math.pi - theta_range
+
+	amount:int = 2
+	if 2 * radius > CIRCLE_TOLERANCE:
+		amount = max(2, math.ceil( theta_range / (2 * math.acos(1 - CIRCLE_TOLERANCE / radius)) ))
+
+	flat:list = []
+	for i in range(amount):
+		theta:float = theta_start + direction * (i / (amount - 1)) * theta_range
+		flat.append( (center_x + math.cos(theta) * radius, center_y + math.sin(theta) * radius) )
+
+	return flat
+
+def flattenCatmull(points:list) -> list:
+	flat:list = []
+	for i in range(len(points) - 1):
+		v1:tuple = points[i - 1] if i > 0 else points[i]
+		v2:tuple = points[i]
+		v3:tuple = points[i + 1]
+		v4:tuple = points[i + 2] if i + 2 < len(points) else (2 * v3[0] - v2[0], 2 * v3[1] - v2[1])
+
+		for step in range(CATMULL_DETAIL):
+			t:float = step / CATMULL_DETAIL
+			flat.append( (catmull(v1[0], v2[0], v3[0], v4[0], t), catmull(v1[1], v2[1], v3[1], v4[1], t)) )
+
+	flat.append(points[-1])
+	return flat
+
+def catmull(p1:float, p2:float, p3:float, p4:float, t:float) -> float:
+	t2:float = t * t
+	t3:float = t2 * t
+	return 0.5 * (
+		2 * p2 +
+		(-p1 + p3) * t +
+		(2 * p1 - 5 * p2 + 4 * p3 - p4) * t2 +
+		(-p1 + 3 * p2 - 3 * p3 + p4) * t3
+	)
+
+def cutPath(flat:list, distance:float) -> tuple:
+	"""
+		cuts the flat path at distance (or extends its last segment up to distance),
+		returns ( x, y, lengths ) arrays
+	"""
+	xs:array = array('d')
+	ys:array = array('d')
+	lengths:array = array('d')
+	if not flat:
+		return ( xs, ys, lengths )
+
+	xs.append(flat[0][0])
+	ys.append(flat[0][1])
+	lengths.append(0.0)
+
+	total:float = 0.0
+	for px, py in flat[1:]:
+		segment:float = math.hypot(px - xs[-1], py - ys[-1])
+		if not segment: continue
+
+		if distance > 0 and total + segment >= distance:
+			t:float = (distance - total) / segment
+			px = xs[-1] + (px - xs[-1]) * t
+			py = ys[-1] + (py - ys[-1]) * t
+			segment = distance - total
+
+		total += segment
+		xs.append(px)
+		ys.append(py)
+		lengths.append(total)
+
+		if distance > 0 and total >= distance:
+			return ( xs, ys, lengths )
+
+	# path is shorter than the slider, extend the last segment
+	if distance > total and len(xs) > 1:
+		dx:float = xs[-1] - xs[-2]
+		dy:float = ys[-1] - ys[-2]
+		segment:float = math.hypot(dx, dy)
+		extend:float = distance - total
+		xs.append(xs[-1] + dx / segment * extend)
+		ys.append(ys[-1] + dy / segment * extend)
+		lengths.append(distance)
+
+	return ( xs, ys, lengths )
@@ -1,18 +1,23 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 if TYPE_CHECKING:
 	from .osumap import OsuMap
+	from .osustatsnumpy import OsuStatsGeometry
 
 import math
+from array import array
 from .vector import Vector
 from .osudifficulty import OsuDifficulty
-from .osuobject import OsuHitObject, OSU_OBJ_SPINNER, OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER
+from .osuobject import OSU_OBJ_SPINNER, OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER
+from .osuobjectstore import hitObjectColumns
 from .osumod import OsuModIndex
+from .osuprofile import OsuTimings
 
 DIFF_SPEED:int = 0
 DIFF_AIM:int = 1
 
 # strain stuff
 DECAY_BASE:list = [ 0.3, 0.15 ] # strain decay per interval
+DECAY_WEIGHT:float = 0.9 # max strains are weighted from highest to lowest, this is how much the weight decays
 WEIGHT_SCALING:list = [ 1400.0, 26.25 ] # balances speed and aim
 
 # spacing weight stuff
@@ -24,14 +29,47 @@ SPEED_ANGLE_BONUS_BEGIN:float = 5 * math.pi / 6
 AIM_ANGLE_BONUS_BEGIN:float = math.pi / 3
 SINGLE_SPACING:int = 125 # arbitrary thresholds to determine when a stream is spaced enough that it becomes hard to alternate
 
+class OsuStatsWorkspace(object):
+	"""
+		everything a python engine calculation writes per hit object (index = index of the hit object),
+		kept out of the hit objects, so the same map can be calculated by multiple threads at once
+	"""
+	def __init__(self, amount:int):
+		self.NormPos:list = [None] * amount
+		self.angle:list = [0.0] * amount
+		self.strains:list = [ [0.0] * amount, [0.0] * amount ]
+		self.is_single:list = [False] * amount
+		self.delta_time:list = [0.0] * amount
+		self.delta_distance:list = [0.0] * amount
+
+		# columns of the map, see calcNormPos()
+		self.starttime:list or array = None
+		self.osu_obj:list or array = None
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} objects={len(self.NormPos)}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
 class OsuStats(object):
 	"""
 		contains everything to calculate star rating and more
+		the per object values of a calculation are in self.Workspace (OsuStatsWorkspace),
+		it only exists during calc()
+
+		self.strains are the sorted aim section strains (like in oppai),
+		self.section_strains the chronological section strains of speed and aim (index DIFF_SPEED, DIFF_AIM),
+		see sectionStrains(), objectStrains() and strainGraph() to export them
 	"""
-	def __init__(self, Map:"OsuMap"):
+	def __init__(self, Map:"OsuMap", Difficulty:OsuDifficulty=None):
 		self.Map:"OsuMap" = Map
+		self.Difficulty:OsuDifficulty = Difficulty
 
 		self.strains:list = []
+		self.section_strains:list = [ array('d'), array('d') ]
+		self.object_strains:list = None # see objectStrains()
+		self.engine:str = "python"
 		self.total:float = 0.0
 		self.aim:float = 0.0
 		self.aim_difficulty:float = 0.0
@@ -41,6 +79,9 @@ class OsuStats(object):
 		self.speed_length_bonus:float = 0.0
 		self.amount_singles:int = 0
 		self.amount_singles_threshold:int = 0
+		self.map_values:dict = None # max_combo and amount_* of the map, only set by OsuResultCache.getStats()
+		self.Timings:OsuTimings = None
+		self.Workspace:OsuStatsWorkspace = None
 
 	def __repr__(self) -> str:
 		return f"<{self.__class__.__name__} stars={round(self.total, 2)} (aim={round(self.aim, 2)} speed={round(self.speed, 2)})>"
@@ -48,37 +89,109 @@ class OsuStats(object):
 	def __str__(self) -> str:
 		return self.__repr__()
 
-	def calc(self, singletap_threshold:int=125) -> None:
+	def calc(self, singletap_threshold:int=125, engine:str="python", profile:bool=False) -> None:
 		"""
 			calculates everything and stores it in self.*
 			self.total prob. is what most people want
 			takes all changes made by mods in consideration.
 			(
-				aka it uses the Maps.__Diff,
-				that is set by the maps.getCalc automaticly (or at least should)
+				aka it uses self.Difficulty, if it was given
+				or the last Map.getDifficulty()
 			)
 
 			NOTE: From Francesco149:
 			singletap_threshold is the smallest milliseconds interval
 			that will be considered singletappable, defaults to 125ms
 			which is 240 bpm 1/2 ((60000 / 240) / 2)
-		"""
-		Difficulty:OsuDifficulty = self.Map.getDifficulty()
 
-		# non-normalized diameter where the small circle size buff starts
-		CIRCLESIZE_BUFF_THRESHOLD:int = 30
-		STAR_SCALING_FACTOR:float = 0.0675 # global stars multiplier
+			engine can be:
+				"python" (default), calculates everything object by object
+				"numpy", calculates everything as whole arrays, needs numpy installed.
+					results match the python engine within a relative tolerance of 1e-9
+					(osustatsnumpy.NUMPY_TOLERANCE), it needs no Workspace
 
-		# 50% of the difference between aim and speed is added to
-		# star rating to compensate aim only or speed only maps
-		EXTREME_SCALING_FACTOR:float = 0.5
-		PLAYFIELD_WIDTH:int = 512 # in osu!pixels
-		PlayfieldCenter:Vector = Vector( PLAYFIELD_WIDTH / 2, PLAYFIELD_WIDTH / 2 )
+			with profile=True, the time of every phase is recorded in self.Timings (OsuTimings)
+		"""
+		self.Timings = OsuTimings() if profile else None
+		self.engine = engine
+		self.object_strains = None
+
+		Difficulty:OsuDifficulty = self.Difficulty or self.Map.getDifficulty()
 
 		if self.Map.mode != 0:
 			raise NotADirectoryError()
 
-		circle_radius:float = ( (PLAYFIELD_WIDTH/16) * (1 - (0.7 * (Difficulty.cs - 5)) / 5) )
+		scaling_factor:float = self.scalingFactor(Difficulty.cs)
+
+		Geometry:"OsuStatsGeometry" = None
+		if engine == "numpy":
+			from .osustatsnumpy import OsuStatsGeometry
+			Geometry = OsuStatsGeometry(self.Map)
+			if self.Timings is not None: self.Timings.lap("geometry", len(self.Map.hitobjects))
+
+		individuals:tuple = self.calcIndividuals(Difficulty, scaling_factor, singletap_threshold, engine=engine, Geometry=Geometry)
+		self.Workspace = None
+		self.applyIndividuals(Difficulty, individuals)
+		if self.Timings is not None: self.Timings.lap("stars", len(self.Map.hitobjects))
+
+	@classmethod
+	def calcMany(cls, Map:"OsuMap", Difficulties:list, singletap_threshold:int=125, engine:str="python") -> list:
+		"""
+			calculates a OsuStats for every OsuDifficulty in Difficulties (same order)
+
+			only the circle size scaling and the speed_multiplier change the strains,
+			so they are only calculated once per ( scaling_factor, speed_multiplier ) class.
+			the angles are only calculated once per scaling_factor (numpy: the whole geometry),
+			every result is exactly the same as the one of a single calc()
+		"""
+		if Map.mode != 0:
+			raise NotADirectoryError()
+
+		Geometry:"OsuStatsGeometry" = None
+		if engine == "numpy":
+			from .osustatsnumpy import OsuStatsGeometry
+			Geometry = OsuStatsGeometry(Map)
+
+		classes:dict = {}
+		results:list = []
+		angles:dict = {} # scaling_factor -> angles of the Workspace
+		for Difficulty in Difficulties:
+			Stats:OsuStats = cls(Map, Difficulty)
+			Stats.engine = engine
+
+			scaling_factor:float = cls.scalingFactor(Difficulty.cs)
+			key:tuple = (scaling_factor, Difficulty.speed_multiplier)
+
+			if key not in classes:
+				if scaling_factor in angles:
+					# only the speed_multiplier is different, the angles can be reused
+					Stats.Workspace = OsuStatsWorkspace(len(Map.hitobjects))
+					Stats.Workspace.angle = angles[scaling_factor]
+
+				classes[key] = Stats.calcIndividuals(
+					Difficulty, scaling_factor, singletap_threshold,
+					engine=engine, Geometry=Geometry, calc_angle=(scaling_factor not in angles)
+				)
+
+				if Stats.Workspace is not None:
+					angles[scaling_factor] = Stats.Workspace.angle
+					Stats.Workspace = None
+
+			Stats.applyIndividuals(Difficulty, classes[key])
+			results.append(Stats)
+
+		return results
+
+	@staticmethod
+	def scalingFactor(cs:float) -> float:
+		"""
+			factor to normalize positions on the circle radius of cs
+		"""
+		# non-normalized diameter where the small circle size buff starts
+		CIRCLESIZE_BUFF_THRESHOLD:int = 30
+		PLAYFIELD_WIDTH:int = 512 # in osu!pixels
+
+		circle_radius:float = ( (PLAYFIELD_WIDTH/16) * (1 - (0.7 * (cs - 5)) / 5) )
 
 		# positions are normalized on circle radius,
 		# so that we can calc as if everything was the same circlesize
@@ -88,15 +201,166 @@ class OsuStats(object):
 		if circle_radius < CIRCLESIZE_BUFF_THRESHOLD:
 			scaling_factor *= (1.0 + min(CIRCLESIZE_BUFF_THRESHOLD - circle_radius, 5.0) / 50.0)
 
+		return scaling_factor
+
+	def calcIndividuals(self, Difficulty:OsuDifficulty, scaling_factor:float, singletap_threshold:int, engine:str="python", Geometry:"OsuStatsGeometry"=None, calc_angle:bool=True) -> tuple:
+		"""
+			calculates speed and aim with the wanted engine
+			returns ( speed, aim, strains, amount_singles, amount_singles_threshold )
+			speed and aim are the ( difficulty, total, chronological sections ) results of calcIndividual
+		"""
+		if engine == "numpy":
+			return self.calcNumpy(Difficulty, scaling_factor, singletap_threshold, Geometry)
+
+		elif engine != "python":
+			raise NotImplementedError(f"unknown engine: {engine}")
+
+		return self.finishSteps( self.calcIndividualsSteps(Difficulty, scaling_factor, singletap_threshold, calc_angle=calc_angle) )
+
+	def calcSteps(self, singletap_threshold:int=125, chunk_size:int=1000) -> Generator[None, None, None]:
+		"""
+			calc() with the python engine, as generator that yields after every chunk_size hit objects
+			of the strain loops, so the calculation can be split up (see osuasync).
+			results are the same as calc()
+		"""
+		Difficulty:OsuDifficulty = self.Difficulty or self.Map.getDifficulty()
+
+		if self.Map.mode != 0:
+			raise NotADirectoryError()
+
+		scaling_factor:float = self.scalingFactor(Difficulty.cs)
+
+		individuals:tuple = yield from self.calcIndividualsSteps(Difficulty, scaling_factor, singletap_threshold, chunk_size=chunk_size)
+		self.Workspace = None
+		self.applyIndividuals(Difficulty, individuals)
+
+	def calcIndividualsSteps(self, Difficulty:OsuDifficulty, scaling_factor:float, singletap_threshold:int, calc_angle:bool=True, chunk_size:int=0) -> Generator[None, None, tuple]:
+		"""
+			the python engine of calcIndividuals(), as generator.
+			yields after every chunk_size hit objects of the strain loops (never for 0)
+			and returns the result of calcIndividuals()
+		"""
+		PLAYFIELD_WIDTH:int = 512 # in osu!pixels
+		PlayfieldCenter:Vector = Vector( PLAYFIELD_WIDTH / 2, PLAYFIELD_WIDTH / 2 )
+
 		# normalize playarea, based on circle size
 		PlayfieldCenter *= scaling_factor
 
 		# give every object a NormPos before calculating stuff
-		self.calcNormPos(PlayfieldCenter, scaling_factor)
+		self.calcNormPos(PlayfieldCenter, scaling_factor, calc_angle=calc_angle)
+		if self.Timings is not None: self.Timings.lap("norm_pos", len(self.Map.hitobjects))
 
 		# get pp and diff stats
-		speed = self.calcIndividual(Difficulty, DIFF_SPEED)
-		aim = self.calcIndividual(Difficulty, DIFF_AIM)
+		speed:tuple = yield from self.calcIndividualSteps(Difficulty, DIFF_SPEED, chunk_size)
+		aim:tuple = yield from self.calcIndividualSteps(Difficulty, DIFF_AIM, chunk_size)
+
+		amount_singles:int = 0
+		amount_singles_threshold:int = 0
+		is_single:list = self.Workspace.is_single
+
+		starttime:list or array = self.Workspace.starttime
+		osu_obj:list or array = self.Workspace.osu_obj
+
+		# single taps stats... do i need this? mm who cares
+		for i in range(1, len(starttime)):
+			if is_single[i]:
+				amount_singles += 1
+
+			if not osu_obj[i] & (OSU_OBJ_CIRCLE | OSU_OBJ_SLIDER):
+				continue
+
+			interval:float = (starttime[i] - starttime[i - 1]) - Difficulty.speed_multiplier
+
+			if interval >= singletap_threshold:
+				amount_singles_threshold += 1
+
+		if self.Timings is not None: self.Timings.lap("singles", len(self.Map.hitobjects))
+
+		return ( speed, aim, self.strains, amount_singles, amount_singles_threshold )
+
+	def calcNumpy(self, Difficulty:OsuDifficulty, scaling_factor:float, singletap_threshold:int, Geometry:"OsuStatsGeometry"=None) -> tuple:
+		"""
+			the numpy engine of calcIndividuals(), see osustatsnumpy
+		"""
+		from . import osustatsnumpy
+
+		if Geometry is None:
+			Geometry = osustatsnumpy.OsuStatsGeometry(self.Map)
+
+		Timings:OsuTimings = self.Timings
+
+		speed:tuple = osustatsnumpy.calcIndividual(Geometry, scaling_factor, Difficulty.speed_multiplier, DIFF_SPEED)
+		if Timings is not None: Timings.lap("speed", Geometry.amount, len(speed[2]))
+
+		aim:tuple = osustatsnumpy.calcIndividual(Geometry, scaling_factor, Difficulty.speed_multiplier, DIFF_AIM)
+		if Timings is not None: Timings.lap("aim", Geometry.amount, len(aim[2]))
+
+		amount_singles, amount_singles_threshold = osustatsnumpy.countSingles(
+			Geometry, speed[4], Difficulty.speed_multiplier, singletap_threshold
+		)
+		if Timings is not None: Timings.lap("singles", Geometry.amount)
+
+		return (
+			( speed[0], speed[1], array('d', speed[5]) ), ( aim[0], aim[1], array('d', aim[5]) ),
+			aim[2], amount_singles, amount_singles_threshold
+		)
+
+	def calcObjectStrains(self, Difficulty:OsuDifficulty, scaling_factor:float, engine:str="python") -> tuple:
+		"""
+			calculates only the strain of every hit object, without the sections
+			returns ( speed strains, aim strains ) as lists in order of the hit objects
+		"""
+		if engine == "numpy":
+			from . import osustatsnumpy
+
+			Geometry:osustatsnumpy.OsuStatsGeometry = osustatsnumpy.OsuStatsGeometry(self.Map)
+			delta_time, delta_distance, angle = osustatsnumpy.deltas(Geometry, scaling_factor, Difficulty.speed_multiplier)
+
+			return (
+				osustatsnumpy.objectStrains(Geometry, delta_time, delta_distance, angle, DIFF_SPEED)[0],
+				osustatsnumpy.objectStrains(Geometry, delta_time, delta_distance, angle, DIFF_AIM)[0]
+			)
+
+		elif engine != "python":
+			raise NotImplementedError(f"unknown engine: {engine}")
+
+		if not self.Map.hitobjects: raise RuntimeError("there is nothing to calculate")
+
+		PLAYFIELD_WIDTH:int = 512 # in osu!pixels
+		PlayfieldCenter:Vector = Vector( PLAYFIELD_WIDTH / 2, PLAYFIELD_WIDTH / 2 ) * scaling_factor
+		self.calcNormPos(PlayfieldCenter, scaling_factor)
+
+		for difftype in (DIFF_SPEED, DIFF_AIM):
+			for i in range(1, len(self.Map.hitobjects)):
+				self.deltaStrain(difftype, i, Difficulty)
+
+		strains:list = self.Workspace.strains
+		self.Workspace = None
+
+		return ( strains[DIFF_SPEED], strains[DIFF_AIM] )
+
+	def applyIndividuals(self, Difficulty:OsuDifficulty, individuals:tuple) -> None:
+		"""
+			stores the result of calcIndividuals() and calculates the stars with it
+		"""
+		speed, aim, strains, amount_singles, amount_singles_threshold = individuals
+
+		self.strains = list(strains)
+		self.section_strains = [ speed[2], aim[2] ]
+		self.amount_singles = amount_singles
+		self.amount_singles_threshold = amount_singles_threshold
+
+		self.calcStars(Difficulty, speed, aim)
+
+	def calcStars(self, Difficulty:OsuDifficulty, speed:tuple, aim:tuple) -> None:
+		"""
+			turns the ( difficulty, total, ... ) results of calcIndividual into stars
+		"""
+		STAR_SCALING_FACTOR:float = 0.0675 # global stars multiplier
+
+		# 50% of the difference between aim and speed is added to
+		# star rating to compensate aim only or speed only maps
+		EXTREME_SCALING_FACTOR:float = 0.5
 
 		# tempraly stars diff
 		self.speed = speed[0]
@@ -121,53 +385,60 @@ class OsuStats(object):
 		# add extreme
 		self.total += abs(self.speed - self.aim) * EXTREME_SCALING_FACTOR
 
-		# single taps stats... do i need this? mm who cares
-		for i, Obj in enumerate(self.Map.hitobjects[1:]):
-			PrevObject:OsuHitObject = self.Map.hitobjects[i]
-
-			Obj:OsuHitObject = Obj
-
-			if Obj.is_single:
-				self.amount_singles += 1
+	def lengthBonus(self, stars:float, diff:float) -> float:
+		# nothing to calc, happens on maps (or parts of maps) without any strain
+		if stars <= 0: return 0.0
 
-			if not Obj.osu_obj & (OSU_OBJ_CIRCLE | OSU_OBJ_SLIDER):
-				continue
+		return 0.32 + ( 0.5 * (math.log10(diff + stars) - math.log10(stars)) )
 
-			interval:float = (Obj.starttime - PrevObject.starttime) - Difficulty.speed_multiplier
+	def calcNormPos(self, PlayfieldCenter:Vector, scaling_factor:float, calc_angle:bool=True) -> None:
+		"""
+			gives every object a NormPos (and angle) in self.Workspace, creates the Workspace if needed.
+			also puts the starttime and osu_obj columns of the map in it, for everything after
+			calc_angle=False keeps the angles that are already in the Workspace,
+			they have to be from the same scaling_factor
+		"""
+		if self.Workspace is None:
+			self.Workspace = OsuStatsWorkspace(len(self.Map.hitobjects))
 
-			if interval >= singletap_threshold:
-				self.amount_singles_threshold += 1
+		NormPos:list = self.Workspace.NormPos
+		angle:list = self.Workspace.angle
 
-	def lengthBonus(self, stars:float, diff:float) -> float:
-		return 0.32 + ( 0.5 * (math.log10(diff + stars) - math.log10(stars)) )
+		starttime, x, y, osu_obj = hitObjectColumns(self.Map.hitobjects, "starttime", "x", "y", "type")
+		self.Workspace.starttime = starttime
+		self.Workspace.osu_obj = osu_obj
 
-	def calcNormPos(self, PlayfieldCenter:Vector, scaling_factor:float) -> None:
-		PrevObject1:OsuHitObject = None
-		PrevObject2:OsuHitObject = None
-		i:int = 0
-		for Obj in self.Map.hitobjects:
+		for i in range(len(starttime)):
 			# spinner dont have a position, so we give it one
-			if Obj.osu_obj & OSU_OBJ_SPINNER:
-				Obj.NormPos = PlayfieldCenter * 1
+			if osu_obj[i] & OSU_OBJ_SPINNER:
+				NormPos[i] = PlayfieldCenter * 1
 			else:
-				Obj.NormPos = Obj.Pos * scaling_factor
-
-			if i >= 2:
-				# get rest vectors from between the last 2 positions
-				V1:Vector = PrevObject2.NormPos - PrevObject1.NormPos
-				V2:Vector = Obj.NormPos - PrevObject1.NormPos
-				# get Skalar and Determinant
-				dot:float = V1.dot(V2)
-				det:float = (V1.x * V2.y) - (V1.y * V2.x)
-
-				# angle is the arc-tangent from both "sites"
-				Obj.angle = abs(math.atan2(det, dot))
-			else:
-				Obj.angle = None
-
-			PrevObject2 = PrevObject1
-			PrevObject1 = Obj
-			i+=1
+				NormPos[i] = Vector(x[i], y[i]) * scaling_factor
+
+			if calc_angle:
+				if i >= 2:
+					# get rest vectors from between the last 2 positions
+					V1:Vector = NormPos[i - 2] - NormPos[i - 1]
+					V2:Vector = NormPos[i] - NormPos[i - 1]
+					# get Skalar and Determinant
+					dot:float = V1.dot(V2)
+					det:float = (V1.x * V2.y) - (V1.y * V2.x)
+
+					# angle is the arc-tangent from both "sites"
+					angle[i] = abs(math.atan2(det, dot))
+				else:
+					angle[i] = None
+
+	@staticmethod
+	def finishSteps(Steps:Generator) -> object:
+		"""
+			runs a *Steps() generator to the end and returns its result
+		"""
+		try:
+			while True:
+				next(Steps)
+		except StopIteration as Stop:
+			return Stop.value
 
 	def calcIndividual(self, Difficulty:OsuDifficulty, difftype:int) -> tuple:
 		"""
@@ -177,52 +448,41 @@ class OsuStats(object):
 			at this point, every hitobject must have a normpos
 			or overything is going to explode
 		"""
+		return self.finishSteps( self.calcIndividualSteps(Difficulty, difftype) )
+
+	def calcIndividualSteps(self, Difficulty:OsuDifficulty, difftype:int, chunk_size:int=0) -> Generator[None, None, tuple]:
+		"""
+			calcIndividual() as generator, yields after every chunk_size hit objects (never for 0)
+			and returns ( difficulty, total, chronological section strains as array('d') )
+		"""
 		if difftype < 0: raise AttributeError("difftype is needed")
 		if not self.Map.hitobjects: raise RuntimeError("there is nothing to calculate")
 
-		# max strains are weighted from highest to lowest.
-		# this is how much the weight decays
-		DECAY_WEIGHT:float = 0.9
-
 		# NOTE From Francesco149:
 		# strains are calculated by analyzing the map in chunks
 		# and taking the peak strains in each chunk. this is the
 		# length of a strain interval in milliseconds
 		strain_step:float = 400.0 * Difficulty.speed_multiplier
 
-		# reset before 2nd, calc
-		self.strains = []
+		object_strains:list = self.Workspace.strains[difftype]
+		starttime:list or array = self.Workspace.starttime
 
-		# first object doesn't generate a strain so we begin with
-		# an incremented interval end
-		interval_end:float = math.ceil(self.Map.hitobjects[0].starttime / strain_step) * strain_step
-		max_strain:float = 0.0
+		amount:int = len(starttime)
+		chunk_size = chunk_size or amount
 
 		# remember, skip first
-		for i, NowObject in enumerate(self.Map.hitobjects[1:]):
-			PrevObject:OsuHitObject = self.Map.hitobjects[i]
+		for chunk_start in range(1, amount, chunk_size):
+			if chunk_start > 1: yield
 
 			# calculate all strains for all objects
-			self.deltaStrain(difftype, PrevObject, NowObject, Difficulty)
-
-			while NowObject.starttime > interval_end:
-				# add max strain for this interval
-				self.strains.append(max_strain)
-
-				# decay last object's strains until the next
-				# interval and use that as the initial max strain
-				decay = pow(
-					DECAY_BASE[difftype],
-					(interval_end - PrevObject.starttime) / 1000.0
-				)
-
-				max_strain = PrevObject.strains[difftype] * decay
-				interval_end += strain_step
+			for i in range(chunk_start, min(chunk_start + chunk_size, amount)):
+				self.deltaStrain(difftype, i, Difficulty)
 
-			max_strain = max(max_strain, NowObject.strains[difftype])
+		self.strains = sectionStates(starttime, object_strains, strain_step, difftype)[0]
+		sections:array = array('d', self.strains)
 
-		# re-add last strain
-		self.strains.append(max_strain)
+		name:str = ("speed", "aim")[difftype]
+		if self.Timings is not None: self.Timings.lap(f"{name}_strain", amount, len(self.strains))
 
 		# weight the top strains sorted from highest to lowest
 		weight:float = 1.0
@@ -236,41 +496,102 @@ class OsuStats(object):
 			difficulty += strain * weight
 			weight *= DECAY_WEIGHT
 
-		return ( difficulty, total )
+		if self.Timings is not None: self.Timings.lap(f"{name}_weight", amount, len(self.strains))
+
+		return ( difficulty, total, sections )
+
+	# strain export
+	def sectionStrains(self, difftype:int, as_numpy:bool=False) -> array:
+		"""
+			peak strain of every section (400ms * speed_multiplier) for difftype, in chronological order.
+			array('d') (supports the buffer protocol) or a numpy view on it (nothing is copied)
+		"""
+		if not self.section_strains[difftype] and self.Map.hitobjects:
+			# results from a OsuResultCache have no strains, so calculate them again
+			Stats:OsuStats = OsuStats(self.Map, self.Difficulty)
+			Stats.calc(engine=self.engine)
+			self.section_strains = Stats.section_strains
+
+		return exportStrains(self.section_strains[difftype], as_numpy)
+
+	def objectStrains(self, difftype:int, as_numpy:bool=False) -> array:
+		"""
+			strain of every hit object for difftype, in order of the hit objects.
+			calculated on first call (see calcObjectStrains()), like sectionStrains()
+		"""
+		if self.object_strains is None:
+			Difficulty:OsuDifficulty = self.Difficulty or self.Map.getDifficulty()
+			speed, aim = self.calcObjectStrains(Difficulty, self.scalingFactor(Difficulty.cs), engine=self.engine)
+			self.object_strains = [ array('d', speed), array('d', aim) ]
+
+		return exportStrains(self.object_strains[difftype], as_numpy)
+
+	def strainGraph(self, difftype:int, buckets:int=200, objects:bool=False, as_numpy:bool=False) -> array:
+		"""
+			the strains of difftype downsampled to buckets values (max of every bucket), for graphs.
+			uses the section strains, or the object strains (bucketed by their time) with objects=True
+		"""
+		graph:array = array('d', [0.0]) * buckets
+
+		if not objects:
+			sections:array = self.sectionStrains(difftype)
+			amount:int = len(sections)
+			for bucket in range(buckets if amount else 0):
+				start:int = (bucket * amount) // buckets
+				end:int = max(start + 1, ((bucket + 1) * amount) // buckets)
+				graph[bucket] = max(sections[start:end])
+
+			return exportStrains(graph, as_numpy)
+
+		strains:array = self.objectStrains(difftype)
+		starttimes:list or array = hitObjectColumns(self.Map.hitobjects, "starttime")[0]
 
-	def deltaStrain(self, difftype:int, PrevObject:OsuHitObject, NowObject:OsuHitObject, Difficulty:OsuDifficulty) -> None:
+		if not starttimes: return exportStrains(graph, as_numpy)
+
+		first:float = starttimes[0]
+		length:float = (starttimes[-1] - first) or 1.0
+		for starttime, strain in zip(starttimes, strains):
+			bucket:int = min( int((starttime - first) / length * buckets), buckets - 1 )
+			if strain > graph[bucket]:
+				graph[bucket] = strain
+
+		return exportStrains(graph, as_numpy)
+
+	def deltaStrain(self, difftype:int, index:int, Difficulty:OsuDifficulty) -> None:
 		"""
-			calculates the difftype strain value for a hitobject.
-			stores
-			the result in obj.strains[difftype]
+			calculates the difftype strain value for the hitobject at index
+			(compared to the one before), stores
+			the result in self.Workspace.strains[difftype][index]
 			this assumes that normpos is already computed
 		"""
+		Workspace:OsuStatsWorkspace = self.Workspace
+		strains:list = Workspace.strains[difftype]
 
 		value:float = 0.0
-		time_elapsed:float = (NowObject.starttime - PrevObject.starttime) / Difficulty.speed_multiplier
-		NowObject.delta_time = time_elapsed
+		time_elapsed:float = (Workspace.starttime[index] - Workspace.starttime[index - 1]) / Difficulty.speed_multiplier
+		Workspace.delta_time[index] = time_elapsed
 		decay:float = (DECAY_BASE[difftype]) ** (time_elapsed/1000)
 
 		# this implementation doesn't account for sliders
 		# Note from me to Francesco149: sliders? do you mean spinners?
-		if NowObject.osu_obj & ( OSU_OBJ_SLIDER | OSU_OBJ_CIRCLE):
-			distance:float = (NowObject.NormPos - PrevObject.NormPos).length
-			NowObject.delta_distance = distance
+		if Workspace.osu_obj[index] & ( OSU_OBJ_SLIDER | OSU_OBJ_CIRCLE):
+			distance:float = (Workspace.NormPos[index] - Workspace.NormPos[index - 1]).length
+			Workspace.delta_distance[index] = distance
 
 			value, is_single = self.deltaSpacingWeight(
 				difftype,
-				NowObject.delta_distance, NowObject.delta_time,
-				PrevObject.delta_distance, PrevObject.delta_time,
-				NowObject.angle
+				distance, time_elapsed,
+				Workspace.delta_distance[index - 1], Workspace.delta_time[index - 1],
+				Workspace.angle[index]
 			)
 
 			value *= WEIGHT_SCALING[difftype]
 
 			# we found out the object is a single type, so we set it
 			if difftype == DIFF_SPEED:
-				NowObject.is_single = is_single
+				Workspace.is_single[index] = is_single
 
-		NowObject.strains[difftype] = (PrevObject.strains[difftype] * decay) + value
+		strains[index] = (strains[index - 1] * decay) + value
 
 	def deltaSpacingWeight(self, *x) -> tuple:
 		# NOTE: everything happening in this part... is to high for me
@@ -348,3 +669,52 @@ class OsuStats(object):
 		res /= strain_time
 
 		return (res, is_single)
+
+def sectionStates(starttime:list, strains:list, strain_step:float, difftype:int, keep_states:bool=False) -> tuple:
+	"""
+		peak strain of every strain_step long section, in chronological order,
+		from the starttime and strain of every object. used by every engine and OsuTimeline
+		returns ( sections, states ), with keep_states, states is the
+		( amount of completed sections, current max strain ) after every object, otherwise None
+	"""
+	sections:list = []
+	states:list = [ (0, 0.0) ] if keep_states else None
+
+	# first object doesn't generate a strain so we begin with
+	# an incremented interval end
+	interval_end:float = math.ceil(starttime[0] / strain_step) * strain_step
+	max_strain:float = 0.0
+
+	for i in range(1, len(starttime)):
+		while starttime[i] > interval_end:
+			# add max strain for this interval
+			sections.append(max_strain)
+
+			# decay last object's strains until the next
+			# interval and use that as the initial max strain
+			decay:float = pow(
+				DECAY_BASE[difftype],
+				(interval_end - starttime[i-1]) / 1000.0
+			)
+
+			max_strain = strains[i-1] * decay
+			interval_end += strain_step
+
+		max_strain = max(max_strain, strains[i])
+		if keep_states: states.append( (len(sections), max_strain) )
+
+	# re-add last strain
+	sections.append(max_strain)
+	return (sections, states)
+
+def exportStrains(values:array, as_numpy:bool=False) -> array:
+	"""
+		values as they are, or as numpy array that shares the memory of values
+	"""
+	if not as_numpy: return values
+
+	from .osustatsnumpy import numpy, requireNumpy
+	requireNumpy()
+
+	if not values: return numpy.zeros(0)
+	return numpy.frombuffer(values, dtype=numpy.float64)
@@ -0,0 +1,241 @@
+"""
+	numpy backend for OsuStats.calc(engine="numpy")
+
+	every delta, distance, angle and spacing weight is calculated as a whole-array operation,
+	only the decaying strain recurrence and the 400ms section peaks are walked sequentially.
+
+	positions, distances and angles are calculated in the same order of operations as the python engine,
+	so they are bit for bit the same. the results match the python engine within a relative tolerance
+	of NUMPY_TOLERANCE, the difference only comes from numpy.power and the sums over numpy arrays
+
+	unlike the python engine, no hit object is touched (and no OsuStatsWorkspace is needed),
+	so a columnar map is never materialized
+"""
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+
+import math
+from .osuobject import OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER, OSU_OBJ_SPINNER
+from .osuobjectstore import hitObjectColumns
+from .osustats import (
+	DIFF_SPEED, DIFF_AIM, DECAY_BASE, DECAY_WEIGHT, WEIGHT_SCALING,
+	MIN_SPEED_BONUS, MAX_SPEED_BONUS, ANGLE_BONUS_SCALE, AIM_TIMING_THRESHOLD,
+	SPEED_ANGLE_BONUS_BEGIN, AIM_ANGLE_BONUS_BEGIN, SINGLE_SPACING, sectionStates
+)
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+NUMPY_TOLERANCE:float = 1e-9
+
+PLAYFIELD_WIDTH:int = 512 # in osu!pixels, same as in OsuStats.calc
+
+def requireNumpy() -> None:
+	if numpy is None:
+		raise ImportError("the numpy engine needs numpy, install it with: pip install numpy")
+
+class OsuStatsGeometry(object):
+	"""
+		the mod independent part of a map, as numpy arrays
+
+		positions are in raw osu!pixels, normalized() scales them with the scaling_factor of a circle size.
+		the angles depend on the scaling as well (in the last bits, which can flip the angle bonus),
+		so they are calculated from the scaled positions, once per scaling_factor
+	"""
+	def __init__(self, Map:"OsuMap"):
+		requireNumpy()
+		if not Map.hitobjects: raise RuntimeError("there is nothing to calculate")
+
+		# columnar maps are copied from their arrays without creating any object
+		columns:tuple = hitObjectColumns(Map.hitobjects, "starttime", "x", "y", "type")
+		starttime = numpy.array(columns[0], dtype=numpy.float64)
+		x = numpy.array(columns[1], dtype=numpy.float64)
+		y = numpy.array(columns[2], dtype=numpy.float64)
+		osu_obj = numpy.array(columns[3], dtype=numpy.int64)
+		amount:int = len(starttime)
+
+		# spinner dont have a position, so we give them the center
+		spinner = (osu_obj & OSU_OBJ_SPINNER) != 0
+		x = numpy.where(spinner, PLAYFIELD_WIDTH / 2, x)
+		y = numpy.where(spinner, PLAYFIELD_WIDTH / 2, y)
+
+		self.amount:int = amount
+		self.starttime = starttime
+		self.x = x
+		self.y = y
+		self.positional = (osu_obj & (OSU_OBJ_CIRCLE | OSU_OBJ_SLIDER)) != 0
+		self.__normalized:dict = {}
+
+	def normalized(self, scaling_factor:float) -> tuple:
+		"""
+			returns (distance, angle) for every object, from the positions scaled with scaling_factor
+			like OsuStats.calcNormPos does it. distance is 0.0 for the first object,
+			angle is NaN for the first 2 objects (None in the python engine)
+		"""
+		if scaling_factor in self.__normalized:
+			return self.__normalized[scaling_factor]
+
+		x = self.x * scaling_factor
+		y = self.y * scaling_factor
+
+		dx = x[1:] - x[:-1]
+		dy = y[1:] - y[:-1]
+		distance = numpy.zeros(self.amount)
+		distance[1:] = numpy.sqrt( (dx * dx) + (dy * dy) )
+
+		angle = numpy.full(self.amount, numpy.nan)
+		if self.amount > 2:
+			v1x = x[:-2] - x[1:-1]
+			v1y = y[:-2] - y[1:-1]
+			v2x = x[2:] - x[1:-1]
+			v2y = y[2:] - y[1:-1]
+			dot = (v1x * v2x) + (v1y * v2y)
+			det = (v1x * v2y) - (v1y * v2x)
+			angle[2:] = numpy.abs( numpy.arctan2(det, dot) )
+
+		self.__normalized[scaling_factor] = (distance, angle)
+		return (distance, angle)
+
+def deltas(Geometry:OsuStatsGeometry, scaling_factor:float, speed_multiplier:float) -> tuple:
+	"""
+		returns (delta_time, delta_distance, angle) for every object,
+		the first object and spinners have a delta_distance of 0.0, like in the python engine
+	"""
+	delta_time = numpy.zeros(Geometry.amount)
+	delta_time[1:] = numpy.diff(Geometry.starttime) / speed_multiplier
+
+	distance, angle = Geometry.normalized(scaling_factor)
+	delta_distance = numpy.where(Geometry.positional, distance, 0.0)
+	delta_distance[0] = 0.0
+
+	return (delta_time, delta_distance, angle)
+
+def spacingWeightAim(delta_distance, delta_time, prev_delta_distance, prev_delta_time, angle):
+	strain_time = numpy.maximum(delta_time, 50.0)
+	prev_strain_time = numpy.maximum(prev_delta_time, 50.0)
+
+	with numpy.errstate(invalid="ignore"):
+		bonus_mask = angle > AIM_ANGLE_BONUS_BEGIN
+		angle_bonus = numpy.sqrt(
+			numpy.maximum(prev_delta_distance - ANGLE_BONUS_SCALE, 0.0) *
+			numpy.power(numpy.sin(angle - AIM_ANGLE_BONUS_BEGIN), 2.0) *
+			numpy.maximum(delta_distance - ANGLE_BONUS_SCALE, 0.0)
+		)
+		result = numpy.where(
+			bonus_mask,
+			1.5 * numpy.power(numpy.maximum(0.0, angle_bonus), 0.99) / numpy.maximum(AIM_TIMING_THRESHOLD, prev_strain_time),
+			0.0
+		)
+
+	weighted_distance = numpy.power(delta_distance, 0.99)
+	res = numpy.maximum(
+		( result + weighted_distance / numpy.maximum(AIM_TIMING_THRESHOLD, strain_time) ),
+		( weighted_distance / strain_time )
+	)
+	return (res, numpy.zeros(len(res), dtype=bool))
+
+def spacingWeightSpeed(delta_distance, delta_time, prev_delta_distance, prev_delta_time, angle):
+	strain_time = numpy.maximum(delta_time, 50.0)
+
+	is_single = delta_distance > SINGLE_SPACING
+	delta_distance = numpy.minimum(delta_distance, SINGLE_SPACING)
+	delta_time = numpy.maximum(delta_time, MAX_SPEED_BONUS)
+
+	speed_bonus = 1.0 + numpy.where(delta_time < MIN_SPEED_BONUS, ( (MIN_SPEED_BONUS - delta_time) / 40 ) ** 2, 0.0)
+
+	with numpy.errstate(invalid="ignore"):
+		bonus_mask = angle < SPEED_ANGLE_BONUS_BEGIN
+		right_mask = bonus_mask & (angle < math.pi / 2)
+		close_mask = right_mask & (delta_distance < ANGLE_BONUS_SCALE)
+		sharp_mask = close_mask & (angle < (math.pi / 4))
+		soft_mask = close_mask & ~(angle < (math.pi / 4))
+
+		sin = numpy.sin( 1.5 * (SPEED_ANGLE_BONUS_BEGIN - angle) )
+		angle_bonus = numpy.where(bonus_mask, 1.0 + (sin * sin / 3.57), 1.0)
+		angle_bonus = numpy.where(right_mask, 1.28, angle_bonus)
+
+		angle_bonus_part = (1 - 1.28) * numpy.minimum( (ANGLE_BONUS_SCALE - delta_distance) / 10, 1 )
+		angle_bonus = numpy.where(sharp_mask, 1.28 + angle_bonus_part, angle_bonus)
+
+		angle_bonus_part = angle_bonus_part * numpy.sin((math.pi / 2.0 - angle) * 4.0 / math.pi)
+		angle_bonus = numpy.where(soft_mask, 1.28 + angle_bonus_part, angle_bonus)
+
+	res = (1 + (speed_bonus - 1) * 0.75)
+	res = res * angle_bonus
+	res = res * (0.95 + speed_bonus * numpy.power(delta_distance / SINGLE_SPACING, 3.5))
+	res = res / strain_time
+
+	return (res, is_single)
+
+def objectStrains(Geometry:OsuStatsGeometry, delta_time, delta_distance, angle, difftype:int) -> tuple:
+	"""
+		returns (strains, is_single) for every object,
+		the strain of the first object is always 0.0
+	"""
+	if difftype == DIFF_AIM:
+		weight = spacingWeightAim
+	elif difftype == DIFF_SPEED:
+		weight = spacingWeightSpeed
+	else:
+		raise NotImplementedError()
+
+	value, is_single = weight(
+		delta_distance[1:], delta_time[1:],
+		delta_distance[:-1], delta_time[:-1],
+		angle[1:]
+	)
+	positional = Geometry.positional[1:]
+	value = numpy.where(positional, value * WEIGHT_SCALING[difftype], 0.0).tolist()
+	decay = numpy.power(DECAY_BASE[difftype], delta_time[1:] / 1000).tolist()
+
+	# the decaying recurrence can't be vectorized
+	strains:list = [0.0] * Geometry.amount
+	strain:float = 0.0
+	for i in range(1, Geometry.amount):
+		strain = (strain * decay[i-1]) + value[i-1]
+		strains[i] = strain
+
+	singles = numpy.zeros(Geometry.amount, dtype=bool)
+	singles[1:] = is_single & positional
+
+	return (strains, singles)
+
+def weightStrains(sections:list) -> tuple:
+	"""
+		weight the sections sorted from highest to lowest,
+		returns (difficulty, total, sorted sections)
+	"""
+	ordered = numpy.sort( numpy.asarray(sections, dtype=numpy.float64) )[::-1]
+	weights = numpy.power(DECAY_WEIGHT, numpy.arange(len(ordered)))
+
+	difficulty:float = float( numpy.sum(ordered * weights) )
+	total:float = float( numpy.sum(numpy.power(ordered, 1.2)) )
+
+	return (difficulty, total, ordered.tolist())
+
+def calcIndividual(Geometry:OsuStatsGeometry, scaling_factor:float, speed_multiplier:float, difftype:int) -> tuple:
+	"""
+		numpy version of OsuStats.calcIndividual
+		returns (difficulty, total, sorted sections, object strains, is_single, chronological sections)
+	"""
+	delta_time, delta_distance, angle = deltas(Geometry, scaling_factor, speed_multiplier)
+	strains, singles = objectStrains(Geometry, delta_time, delta_distance, angle, difftype)
+
+	strain_step:float = 400.0 * speed_multiplier
+	sections:list = sectionStates(Geometry.starttime.tolist(), strains, strain_step, difftype)[0]
+
+	difficulty, total, ordered = weightStrains(sections)
+	return (difficulty, total, ordered, strains, singles, sections)
+
+def countSingles(Geometry:OsuStatsGeometry, singles, speed_multiplier:float, singletap_threshold:int) -> tuple:
+	"""
+		returns (amount_singles, amount_singles_threshold), same as the end of OsuStats.calc
+	"""
+	interval = numpy.diff(Geometry.starttime) - speed_multiplier
+	amount_singles:int = int( numpy.count_nonzero(singles[1:]) )
+	amount_singles_threshold:int = int( numpy.count_nonzero(Geometry.positional[1:] & (interval >= singletap_threshold)) )
+
+	return (amount_singles, amount_singles_threshold)
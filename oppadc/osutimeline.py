@@ -0,0 +1,206 @@
+from typing import TYPE_CHECKING, Iterator
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+
+from array import array
+from bisect import bisect_left
+from .osudifficulty import OsuDifficulty
+from .osustats import OsuStats, DIFF_SPEED, DIFF_AIM, DECAY_WEIGHT, sectionStates
+from .osupp import OsuPP, OsuPPMapValues
+from .osuobject import OSU_OBJ_CIRCLE, OSU_OBJ_SLIDER, OSU_OBJ_SPINNER
+from .osuobjectstore import hitObjectColumns
+
+class OsuStrainWeights(object):
+	"""
+		holds a growing set of section strains and their weighted sum
+		(sorted from highest to lowest, every strain weighted 0.9 times less than the one before)
+
+		all values that will ever be added must be known in advance, they are ranked once
+		and every add() or weighted() is O(log n), so nothing needs to be sorted again
+	"""
+	def __init__(self, values:list):
+		self.values:list = list(values)
+		self.size:int = 1
+		while self.size < max(1, len(values)):
+			self.size *= 2
+
+		order:list = sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+		self.slot:list = [0] * len(values)
+		for slot, i in enumerate(order):
+			self.slot[i] = slot
+
+		# negated and ascending, to bisect how many values are higher than x
+		self.ranked:list = [-values[i] for i in order]
+
+		self.power:list = [1.0]
+		for _ in range(len(values) + 1):
+			self.power.append(self.power[-1] * DECAY_WEIGHT)
+
+		self.count:list = [0] * (2 * self.size)
+		self.weight:list = [0.0] * (2 * self.size)
+		self.total:float = 0.0
+
+	def add(self, index:int) -> None:
+		"""
+			adds values[index]
+		"""
+		value:float = self.values[index]
+		self.total += pow(value, 1.2)
+
+		node:int = self.size + self.slot[index]
+		self.count[node] = 1
+		self.weight[node] = value
+
+		node //= 2
+		while node:
+			left:int = 2 * node
+			self.count[node] = self.count[left] + self.count[left+1]
+			self.weight[node] = self.weight[left] + (self.power[self.count[left]] * self.weight[left+1])
+			node //= 2
+
+	def query(self, lo:int, hi:int) -> tuple:
+		"""
+			( count, weighted sum ) of all added values in slots [lo, hi)
+		"""
+		left_nodes:list = []
+		right_nodes:list = []
+		lo += self.size
+		hi += self.size
+		while lo < hi:
+			if lo & 1:
+				left_nodes.append(lo)
+				lo += 1
+			if hi & 1:
+				hi -= 1
+				right_nodes.append(hi)
+			lo //= 2
+			hi //= 2
+
+		count:int = 0
+		weight:float = 0.0
+		for node in left_nodes + right_nodes[::-1]:
+			weight += self.power[count] * self.weight[node]
+			count += self.count[node]
+
+		return (count, weight)
+
+	def weighted(self, extra:float) -> tuple:
+		"""
+			( difficulty, total ) of all added values and extra,
+			same as the end of OsuStats.calcIndividual
+		"""
+		split:int = bisect_left(self.ranked, -extra)
+		above, above_weight = self.query(0, split)
+		below, below_weight = self.query(split, len(self.values))
+
+		difficulty:float = above_weight + (self.power[above] * extra) + (self.power[above+1] * below_weight)
+		return ( difficulty, self.total + pow(extra, 1.2) )
+
+class OsuTimeline(object):
+	"""
+		stars and pp of a map, if it would end after a hit object
+		(e.g. for failed plays), one typed array per column
+		iterating gives a dict per point
+	"""
+	COLUMNS:tuple = ("index", "starttime", "max_combo", "total", "aim", "speed", "total_pp", "aim_pp", "speed_pp", "acc_pp")
+
+	def __init__(self):
+		self.index:array = array('i')
+		self.starttime:array = array('d')
+		self.max_combo:array = array('i')
+		self.total:array = array('d')
+		self.aim:array = array('d')
+		self.speed:array = array('d')
+		self.total_pp:array = array('d')
+		self.aim_pp:array = array('d')
+		self.speed_pp:array = array('d')
+		self.acc_pp:array = array('d')
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} points={len(self)}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return len(self.index)
+
+	def __getitem__(self, index:int) -> dict:
+		return { column: getattr(self, column)[index] for column in self.COLUMNS }
+
+	def __iter__(self) -> Iterator[dict]:
+		for i in range(len(self)):
+			yield self[i]
+
+	def append(self, point:tuple) -> None:
+		for column, value in zip(self.COLUMNS, point):
+			getattr(self, column).append(value)
+
+	@classmethod
+	def calc(cls, Map:"OsuMap", Difficulty:OsuDifficulty, step:int=1, engine:str="python", version:int=1, accuracy:float=100, misses:int=0) -> "OsuTimeline":
+		"""
+			walks the map once and calculates the stars and pp
+			for the map ending after every step'th hit object (and the last one).
+			the pp is calculated with accuracy and misses, on max combo of that part
+
+			every point matches a calculation of the cut map,
+			but the strains and sections are only calculated once for the whole map
+		"""
+		if Map.mode != 0:
+			raise NotADirectoryError()
+
+		if step < 1:
+			raise AttributeError("step must be at least 1")
+
+		Stats:OsuStats = OsuStats(Map, Difficulty)
+		strains:tuple = Stats.calcObjectStrains(Difficulty, OsuStats.scalingFactor(Difficulty.cs), engine=engine)
+
+		starttime, types = hitObjectColumns(Map.hitobjects, "starttime", "type")
+		strain_step:float = 400.0 * Difficulty.speed_multiplier
+
+		# for every difftype: the final sections and ( completed sections, current max strain ) after every object
+		sections:list = []
+		states:list = []
+		for difftype in (DIFF_SPEED, DIFF_AIM):
+			result:tuple = sectionStates(starttime, strains[difftype], strain_step, difftype, keep_states=True)
+			# the last section is still open after every object, its max strain is in the states
+			sections.append(result[0][:-1])
+			states.append(result[1])
+
+		Weights:list = [ OsuStrainWeights(sections[DIFF_SPEED]), OsuStrainWeights(sections[DIFF_AIM]) ]
+		added:list = [0, 0]
+
+		PP:OsuPP = OsuPP(Map)
+		Timeline:OsuTimeline = cls()
+
+		amounts:dict = { OSU_OBJ_CIRCLE: 0, OSU_OBJ_SLIDER: 0, OSU_OBJ_SPINNER: 0 }
+		max_combo:int = 0
+
+		for i, (osu_obj, combo) in enumerate( zip(types, Map.objectCombos()) ):
+			amounts[osu_obj] += 1
+			max_combo += combo
+
+			if not (i % step == 0 or i == len(starttime) - 1):
+				continue
+
+			results:list = []
+			for difftype in (DIFF_SPEED, DIFF_AIM):
+				completed, current = states[difftype][i]
+				while added[difftype] < completed:
+					Weights[difftype].add(added[difftype])
+					added[difftype] += 1
+
+				results.append( Weights[difftype].weighted(current) )
+
+			Stats.calcStars(Difficulty, results[DIFF_SPEED], results[DIFF_AIM])
+
+			Values:OsuPPMapValues = OsuPPMapValues(
+				PP, version, Stats=Stats, Difficulty=Difficulty,
+				amount_circle=amounts[OSU_OBJ_CIRCLE], amount_slider=amounts[OSU_OBJ_SLIDER], amount_spinner=amounts[OSU_OBJ_SPINNER],
+				max_combo=max_combo
+			)
+			point:tuple = PP.calcPoint(Values, accuracy=accuracy, misses=misses)
+
+			Timeline.append( (i, starttime[i], max_combo, Stats.total, Stats.aim, Stats.speed) + point[6:10] )
+
+		return Timeline
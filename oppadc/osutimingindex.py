@@ -0,0 +1,114 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+	from .osumap import OsuMap
+
+import bisect
+from array import array
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+class OsuTimingIndex(object):
+	"""
+		the timing points of a map, resolved to what is active at every point:
+			beat_length: ms per beat of the last uninherited timing point (0.0 before there is one)
+			slider_velocity: multiplier of the inherited timing point (1.0 for uninherited ones)
+			px_per_beat: osu!pixels a slider travels per beat, like the max combo calculation uses it
+
+		find() gives the active timing point for a time (bisect),
+		findMany() and queryMany() do it for many times at once (with numpy for numpy arrays).
+
+		like the old max combo walk, a time before the first timing point uses the first one,
+		negative times use no timing point at all (index -1, see the last row of every column)
+	"""
+	def __init__(self, Map:"OsuMap"):
+		self.starttime:array = array('d')
+		self.beat_length:array = array('d')
+		self.slider_velocity:array = array('d')
+		self.px_per_beat:array = array('d')
+
+		beat_length:float = 0.0
+		for TPoint in Map.timingpoints:
+			if TPoint.ms_per_beat > 0:
+				beat_length = TPoint.ms_per_beat
+
+			slider_velocity:float = 1.0
+			if not TPoint.change and TPoint.ms_per_beat < 0:
+				slider_velocity = (-100 / TPoint.ms_per_beat)
+
+			px_per_beat:float = Map.slider_multiplier * 100 * slider_velocity
+			if Map.format_version < 8:
+				px_per_beat /= slider_velocity
+
+			self.starttime.append(TPoint.starttime)
+			self.beat_length.append(beat_length)
+			self.slider_velocity.append(slider_velocity)
+			self.px_per_beat.append(px_per_beat)
+
+		self.amount:int = len(self.starttime)
+
+		# values without timing point, so index -1 can be used directly on every column
+		self.beat_length.append(0.0)
+		self.slider_velocity.append(1.0)
+		self.px_per_beat.append(1.0)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} points={len(self)}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def __len__(self) -> int:
+		return self.amount
+
+	def find(self, time:float) -> int:
+		"""
+			index of the timing point active at time, -1 if there is none
+		"""
+		index:int = bisect.bisect_right(self.starttime, time) - 1
+		if index < 0 and time >= 0 and self.amount:
+			return 0
+
+		return index
+
+	def findMany(self, times:list) -> list:
+		"""
+			find() for every time in times, as list (or numpy array, if times is a numpy array)
+		"""
+		if numpy is not None and isinstance(times, numpy.ndarray):
+			starttime = numpy.frombuffer(self.starttime, dtype=numpy.float64) if self.amount else numpy.zeros(0)
+			indexes = numpy.searchsorted(starttime, times, side="right") - 1
+			if self.amount:
+				indexes[(indexes < 0) & (times >= 0)] = 0
+			return indexes
+
+		return [ self.find(time) for time in times ]
+
+	def beatLength(self, time:float) -> float:
+		return self.beat_length[ self.find(time) ]
+
+	def sliderVelocity(self, time:float) -> float:
+		return self.slider_velocity[ self.find(time) ]
+
+	def pxPerBeat(self, time:float) -> float:
+		return self.px_per_beat[ self.find(time) ]
+
+	def queryMany(self, times:list) -> tuple:
+		"""
+			returns ( beat_length, slider_velocity, px_per_beat ) for every time in times,
+			as arrays ('d') or numpy arrays, if times is a numpy array
+		"""
+		indexes:list = self.findMany(times)
+
+		if numpy is not None and isinstance(times, numpy.ndarray):
+			return tuple(
+				numpy.frombuffer(column, dtype=numpy.float64)[indexes]
+				for column in (self.beat_length, self.slider_velocity, self.px_per_beat)
+			)
+
+		return tuple(
+			array('d', (column[index] for index in indexes))
+			for column in (self.beat_length, self.slider_velocity, self.px_per_beat)
+		)
@@ -0,0 +1,233 @@
+"""
+	long running local calculation service over HTTP
+
+	python -m oppadc.server [--host 127.0.0.1] [--port 8727]
+	python __main__.py server [options]
+
+	parsed maps and calculated stars stay in memory, identical ( map, mods ) requests
+	that come in at the same time are calculated only once,
+	and all pp values of a request are calculated in one OsuPP.calcMany() go.
+
+	GET  /pp?path=map.osu&mods=HDHR&accuracy=98,99,100&misses=0&combo=
+	POST /pp {"path": "map.osu", "mods": "HDHR", "accuracy": [98, 99, 100], "misses": [0], "combo": [null], "version": 1}
+	GET  /status
+"""
+from typing import Callable
+
+import os
+import sys
+import json
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from .osumap import OsuMap
+from .osumapcache import OsuMapCache
+from .osudifficulty import OsuDifficulty
+from .osustats import OsuStats
+from .osupp import OsuPPTable
+
+class OsuService(object):
+	"""
+		keeps parsed maps (OsuMapCache) and maps with calculated stats (per mods) warm,
+		bounded to max_maps and max_results (least recently used are removed first).
+		can be used without the HTTP server, every method is thread safe
+	"""
+	def __init__(self, max_maps:int=128, max_results:int=1024, engine:str="python"):
+		self.Maps:OsuMapCache = OsuMapCache(max_entries=max_maps)
+		self.max_results:int = max_results
+		self.engine:str = engine
+
+		self.hits:int = 0
+		self.calculations:int = 0
+		self.coalesced:int = 0
+
+		self.__lock:threading.Lock = threading.Lock()
+		self.__results:OrderedDict = OrderedDict()
+		self.__pending:dict = {}
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} results={len(self.__results)} hits={self.hits} calculations={self.calculations} coalesced={self.coalesced}>"
+
+	def __str__(self) -> str:
+		return self.__repr__()
+
+	def getMap(self, file_path:str, Mods:object=None) -> OsuMap:
+		"""
+			returns the map of file_path with calculated stats for Mods,
+			if the same map and mods are already calculated by an other thread, it waits for that result.
+			the returned map is shared, don't call anything on it that changes the results (like getPP())
+		"""
+		file_path = os.path.abspath(file_path)
+		Stat:os.stat_result = os.stat(file_path)
+		key:tuple = (file_path, Stat.st_mtime_ns, Stat.st_size, OsuDifficulty.modsValue(Mods))
+
+		with self.__lock:
+			Map:OsuMap = self.__results.get(key)
+			if Map:
+				self.__results.move_to_end(key)
+				self.hits += 1
+				return Map
+
+			Pending:Future = self.__pending.get(key)
+			waiting:bool = Pending is not None
+			if waiting:
+				self.coalesced += 1
+			else:
+				Pending = self.__pending[key] = Future()
+
+		if waiting:
+			return Pending.result()
+
+		try:
+			Map = self.Maps.load(file_path)
+			Map.getStats(Mods=key[3], engine=self.engine)
+
+			with self.__lock:
+				self.__results[key] = Map
+				self.calculations += 1
+				while len(self.__results) > self.max_results:
+					self.__results.popitem(last=False)
+
+			Pending.set_result(Map)
+			return Map
+
+		except BaseException as e:
+			Pending.set_exception(e)
+			raise
+
+		finally:
+			with self.__lock:
+				del self.__pending[key]
+
+	def pp(self, file_path:str, Mods:object=None, accuracy:list=[100], misses:list=[0], combo:list=[None], version:int=1) -> dict:
+		"""
+			stars and the pp for every combination of accuracy, misses and combo (see OsuPP.calcMany)
+		"""
+		Map:OsuMap = self.getMap(file_path, Mods)
+
+		# the map is shared, so the mods are always given (Mods=None would take the last ones of any thread)
+		mods_value:int = OsuDifficulty.modsValue(Mods)
+		Stats:OsuStats = Map.getStats(Mods=mods_value, engine=self.engine)
+		Difficulty:OsuDifficulty = Stats.Difficulty
+		Table:OsuPPTable = Map.getPPBatch(Mods=mods_value, accuracy=accuracy, misses=misses, combo=combo, version=version, engine=self.engine)
+
+		return dict(
+			path=file_path, title=Map.title, artist=Map.artist, version=Map.version,
+			map_id=Map.map_id, mapset_id=Map.mapset_id, mods=Difficulty.mods_str or "NM",
+			ar=Difficulty.ar, od=Difficulty.od, cs=Difficulty.cs, hp=Difficulty.hp,
+			stars=Stats.total, aim=Stats.aim, speed=Stats.speed, max_combo=Map.maxCombo(),
+			pp=list(Table)
+		)
+
+	def status(self) -> dict:
+		return dict(
+			maps=len(self.Maps), results=len(self.__results), pending=len(self.__pending),
+			hits=self.hits, calculations=self.calculations, coalesced=self.coalesced,
+			map_hits=self.Maps.hits, map_misses=self.Maps.misses
+		)
+
+class OsuServiceHandler(BaseHTTPRequestHandler):
+	"""
+		HTTP interface of a OsuService, answers everything as JSON
+	"""
+	Service:OsuService = None
+	quiet:bool = False
+
+	def do_GET(self) -> None:
+		url = urlsplit(self.path)
+		query:dict = { name: values[-1] for name, values in parse_qs(url.query, keep_blank_values=True).items() }
+
+		for name in ("accuracy", "misses", "combo"):
+			if name in query:
+				query[name] = [ (value or None) for value in query[name].split(",") ]
+
+		self.answer(url.path, query)
+
+	def do_POST(self) -> None:
+		try:
+			size:int = int(self.headers.get("Content-Length", 0))
+			query:dict = json.loads(self.rfile.read(size) or b"{}")
+		except ValueError as e:
+			return self.send(400, dict(error=f"invalid request: {e}"))
+
+		self.answer(urlsplit(self.path).path, query)
+
+	def answer(self, path:str, query:dict) -> None:
+		routes:dict = { "/pp": self.routePP, "/status": self.routeStatus }
+		route:Callable = routes.get(path)
+		if not route:
+			return self.send(404, dict(error=f"unknown path: {path}"))
+
+		try:
+			self.send(200, route(query))
+		except (KeyError, ValueError, TypeError) as e:
+			self.send(400, dict(error=f"invalid request: {e.__class__.__name__}: {e}"))
+		except FileNotFoundError as e:
+			self.send(404, dict(error=str(e)))
+		except Exception as e:
+			self.send(500, dict(error=f"{e.__class__.__name__}: {e}"))
+
+	def routePP(self, query:dict) -> dict:
+		def values(name:str, default:list, convert:type) -> list:
+			value:object = query.get(name, default)
+			if not isinstance(value, list): value = [value]
+			return [ None if v is None else convert(v) for v in value ]
+
+		return self.Service.pp(
+			query["path"], query.get("mods") or None,
+			accuracy=values("accuracy", [100], float),
+			misses=values("misses", [0], int),
+			combo=values("combo", [None], int),
+			version=int(query.get("version", 1))
+		)
+
+	def routeStatus(self, _query:dict) -> dict:
+		return self.Service.status()
+
+	def send(self, code:int, content:dict) -> None:
+		data:bytes = json.dumps(content).encode("UTF-8")
+		self.send_response(code)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+
+	def log_message(self, *args) -> None:
+		if not self.quiet:
+			super().log_message(*args)
+
+def createServer(Service:OsuService, host:str="127.0.0.1", port:int=8727, quiet:bool=False) -> ThreadingHTTPServer:
+	"""
+		returns the (not yet running) HTTP server for Service, run it with .serve_forever()
+	"""
+	Handler:type = type("Handler", (OsuServiceHandler,), dict(Service=Service, quiet=quiet))
+	return ThreadingHTTPServer((host, port), Handler)
+
+def main(argv:list=None) -> int:
+	Parser:argparse.ArgumentParser = argparse.ArgumentParser(prog="oppadc server", description="local calculation service with warm caches")
+	Parser.add_argument("--host", default="127.0.0.1")
+	Parser.add_argument("--port", type=int, default=8727)
+	Parser.add_argument("--max-maps", type=int, default=128, help="parsed maps kept in memory (default: 128)")
+	Parser.add_argument("--max-results", type=int, default=1024, help="calculated ( map, mods ) kept in memory (default: 1024)")
+	Parser.add_argument("--engine", default="python", choices=("python", "numpy"))
+	Parser.add_argument("--quiet", action="store_true", help="don't log requests")
+	args:argparse.Namespace = Parser.parse_args(argv)
+
+	Service:OsuService = OsuService(max_maps=args.max_maps, max_results=args.max_results, engine=args.engine)
+	Server:ThreadingHTTPServer = createServer(Service, host=args.host, port=args.port, quiet=args.quiet)
+
+	print(f"serving on http://{args.host}:{Server.server_address[1]}", file=sys.stderr)
+	try:
+		Server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		Server.server_close()
+
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
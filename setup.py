@@ -24,6 +24,9 @@ setuptools.setup(
 	url="https://github.com/The-CJ/oppadc.py",
 	license="MIT",
 	install_requires=requirements,
+	extras_require={
+		"numpy": ["numpy"]
+	},
 	packages=["oppadc"],
 	classifiers=[
 		"Programming Language :: Python :: 3.7",
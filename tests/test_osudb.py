@@ -0,0 +1,144 @@
+"""
+	the osu!.db reader has to read every format version, tested with synthetic databases
+
+		python -m unittest discover tests
+"""
+import io
+import struct
+import unittest
+
+from oppadc import OsuDb
+from oppadc.osudb import OSUDB_VERSION_FLOAT_DIFFICULTY, OSUDB_VERSION_NO_ENTRY_SIZE, OSUDB_VERSION_FLOAT_STARS
+
+# one version for every branch of OsuDb.readBeatmap
+VERSIONS:tuple = (20131201, 20150101, 20200101, 20250107)
+AMOUNT:int = 4
+
+def dbString(value:str) -> bytes:
+	"""
+		0x00 for None, or 0x0b + ULEB128 length + UTF-8
+	"""
+	if value is None: return b"\x00"
+
+	data:bytes = value.encode("UTF-8")
+	size:int = len(data)
+	result:bytearray = bytearray([0x0b])
+	while True:
+		byte:int = size & 0x7f
+		size >>= 7
+		result.append(byte | (0x80 if size else 0))
+		if not size: break
+
+	return bytes(result) + data
+
+def dbStars(version:int, pairs:list) -> bytes:
+	result:bytes = struct.pack("<i", len(pairs))
+	for mods, stars in pairs:
+		if version >= OSUDB_VERSION_FLOAT_STARS:
+			result += struct.pack("<BiBf", 0x08, mods, 0x0c, stars)
+		else:
+			result += struct.pack("<BiBd", 0x08, mods, 0x0d, stars)
+
+	return result
+
+def dbEntry(version:int, index:int) -> bytes:
+	entry:bytes = b"".join(dbString(value) for value in (
+		"Artist", "Artíst", f"Title {index}", "Títle", "Creator", "Insane", "audio.mp3",
+		f"{index:032x}", f"Artist - Title {index} (Creator) [Insane].osu"
+	))
+	entry += struct.pack("<BHHHq", 4, 100 + index, 50, 1, 637000000000000000)
+
+	if version >= OSUDB_VERSION_FLOAT_DIFFICULTY:
+		entry += struct.pack("<ffffd", 9.5, 4.0, 5.5, 8.25, 1.4)
+		entry += dbStars(version, [ (0, 5.25 + index), (64, 7.5) ]) # std
+		entry += dbStars(version, [ (0, 1.5) ]) # taiko
+		entry += dbStars(version, []) # ctb
+		entry += dbStars(version, [ (0, 2.5) ]) # mania
+	else:
+		entry += struct.pack("<BBBBd", 9, 4, 5, 8, 1.4)
+
+	entry += struct.pack("<iii", 90, 95000, 1000)
+	entry += struct.pack("<i", 2) + struct.pack("<ddB", 300.0, 0.0, 1) + struct.pack("<ddB", -100.0, 1000.0, 0)
+	entry += struct.pack("<iii", 1000 + index, 500, 0)
+	entry += b"\x00" * 4 + struct.pack("<hf", 0, 0.7)
+	entry += bytes([index % 2]) + dbString("source") + dbString("tag1 tag2") + struct.pack("<h", 0) + dbString(None)
+	entry += b"\x01" + struct.pack("<q", 0) + b"\x00" + dbString(f"folder {index}") + struct.pack("<q", 0) + b"\x00" * 5
+
+	if version < OSUDB_VERSION_FLOAT_DIFFICULTY:
+		entry += struct.pack("<h", 0)
+
+	entry += struct.pack("<i", 0) + b"\x00"
+
+	if version < OSUDB_VERSION_NO_ENTRY_SIZE:
+		entry = struct.pack("<i", len(entry)) + entry
+
+	return entry
+
+def dbContent(version:int, amount:int=AMOUNT) -> bytes:
+	content:bytes = struct.pack("<ii?q", version, amount, True, 0) + dbString("player") + struct.pack("<i", amount)
+	content += b"".join(dbEntry(version, index) for index in range(amount))
+	return content + struct.pack("<i", 0) # user permissions
+
+class OsuDbTest(unittest.TestCase):
+	def test_header(self):
+		for version in VERSIONS:
+			with self.subTest(version=version):
+				Db:OsuDb = OsuDb(io.BytesIO(dbContent(version)))
+				self.assertEqual(Db.osu_version, version)
+				self.assertEqual(Db.player, "player")
+				self.assertEqual(len(Db), AMOUNT)
+
+	def test_beatmaps(self):
+		for version in VERSIONS:
+			with self.subTest(version=version):
+				Db:OsuDb = OsuDb(io.BytesIO(dbContent(version)))
+				Beatmaps:list = list(Db)
+				self.assertEqual(len(Beatmaps), AMOUNT)
+
+				for index, Beatmap in enumerate(Beatmaps):
+					self.assertEqual(Beatmap.artist_unicode, "Artíst")
+					self.assertEqual(Beatmap.title, f"Title {index}")
+					self.assertEqual(Beatmap.md5, f"{index:032x}")
+					self.assertEqual(Beatmap.file_name, f"Artist - Title {index} (Creator) [Insane].osu")
+					self.assertEqual(Beatmap.amount_circle, 100 + index)
+					self.assertEqual(Beatmap.amount_slider, 50)
+					self.assertEqual(Beatmap.amount_spinner, 1)
+					self.assertEqual(Beatmap.slider_multiplier, 1.4)
+					self.assertEqual(Beatmap.drain_time, 90000.0)
+					self.assertEqual(Beatmap.total_length, 95000.0)
+					self.assertEqual(Beatmap.map_id, 1000 + index)
+					self.assertEqual(Beatmap.mapset_id, 500)
+					self.assertEqual(Beatmap.mode, index % 2)
+					self.assertEqual(Beatmap.source, "source")
+					self.assertEqual(Beatmap.tags, ["tag1", "tag2"])
+					self.assertEqual(Beatmap.folder, f"folder {index}")
+
+					if version >= OSUDB_VERSION_FLOAT_DIFFICULTY:
+						self.assertEqual((Beatmap.ar, Beatmap.cs, Beatmap.hp, Beatmap.od), (9.5, 4.0, 5.5, 8.25))
+						self.assertEqual(Beatmap.stars, 5.25 + index)
+					else:
+						self.assertEqual((Beatmap.ar, Beatmap.cs, Beatmap.hp, Beatmap.od), (9, 4, 5, 8))
+						self.assertEqual(Beatmap.stars, 0.0)
+
+	def test_filter(self):
+		skip_hashes:set = { f"{0:032x}", f"{3:032x}" }
+		for version in VERSIONS:
+			with self.subTest(version=version):
+				Db:OsuDb = OsuDb(io.BytesIO(dbContent(version)))
+				self.assertEqual([Beatmap.map_id for Beatmap in Db.beatmaps(skip_hashes=skip_hashes)], [1001, 1002])
+
+				Db = OsuDb(io.BytesIO(dbContent(version)))
+				self.assertEqual([Beatmap.map_id for Beatmap in Db.beatmaps(modes=(0,))], [1000, 1002])
+
+				Db = OsuDb(io.BytesIO(dbContent(version)))
+				self.assertEqual([Beatmap.map_id for Beatmap in Db.beatmaps(skip_hashes=skip_hashes, modes=(0,))], [1002])
+
+	def test_truncated(self):
+		for version in VERSIONS:
+			with self.subTest(version=version):
+				Db:OsuDb = OsuDb(io.BytesIO(dbContent(version)[:-40]))
+				with self.assertRaises(SyntaxError):
+					list(Db)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,58 @@
+"""
+	the faster ways of calculating have to give the same results as the default python engine
+
+		python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from oppadc import OsuMap
+from oppadc.osustatsnumpy import numpy, NUMPY_TOLERANCE
+from generate import generateMap, MAP_KINDS
+
+AMOUNT:int = 300
+SEEDS:tuple = (727, 1337)
+MODS:tuple = ("", "HR", "EZ", "DT", "HT", "HRDT", "EZHT")
+STATS:tuple = ("total", "aim", "speed", "aim_difficulty", "speed_difficulty")
+
+def sampleMaps() -> list:
+	return [ (f"{kind}-{seed}", generateMap(kind, AMOUNT, seed)) for kind in MAP_KINDS for seed in SEEDS ]
+
+class NumpyParityTest(unittest.TestCase):
+	@unittest.skipIf(numpy is None, "numpy is not installed")
+	def test_stars(self):
+		for name, content in sampleMaps():
+			for mods in MODS:
+				with self.subTest(map=name, mods=mods):
+					Python = OsuMap(raw_str=content).getStats(mods)
+					Numpy = OsuMap(raw_str=content).getStats(mods, engine="numpy")
+					for stat in STATS:
+						self.assertLessEqual(
+							abs(getattr(Numpy, stat) - getattr(Python, stat)),
+							abs(getattr(Python, stat)) * NUMPY_TOLERANCE,
+							stat
+						)
+
+class CalcManyParityTest(unittest.TestCase):
+	def assertManyEqual(self, engine:str):
+		for name, content in sampleMaps():
+			Map:OsuMap = OsuMap(raw_str=content)
+			Many:list = Map.getStatsMulti(list(MODS), engine=engine)
+			for mods, Stats in zip(MODS, Many):
+				with self.subTest(map=name, mods=mods):
+					Single = OsuMap(raw_str=content).getStats(mods, engine=engine)
+					for stat in STATS:
+						self.assertEqual(getattr(Stats, stat), getattr(Single, stat), stat)
+
+	def test_python(self):
+		self.assertManyEqual("python")
+
+	@unittest.skipIf(numpy is None, "numpy is not installed")
+	def test_numpy(self):
+		self.assertManyEqual("numpy")
+
+if __name__ == "__main__":
+	unittest.main()
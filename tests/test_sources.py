@@ -0,0 +1,161 @@
+"""
+	every way of reading a map has to give the same map: the same content hash and the same results
+
+		python -m unittest discover tests
+"""
+import os
+import io
+import sys
+import hashlib
+import zipfile
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from oppadc import OsuMap, iterOsz
+from oppadc.osuobjectstore import hitObjectColumns
+from generate import generateMap, MAP_KINDS
+
+AMOUNT:int = 300
+SEED:int = 727
+MODS:tuple = ("", "HR", "DT", "EZHT")
+PP:tuple = ("total_pp", "aim_pp", "speed_pp", "acc_pp")
+MEMBER:str = "Artist - Title (Creator) [Insane].osu"
+
+def samplePP(Map:OsuMap) -> list:
+	return [ tuple(getattr(Map.getPP(mods), name) for name in PP) for mods in MODS ]
+
+class SourceTest(unittest.TestCase):
+	def setUp(self):
+		self.directory:tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+		self.maps:dict = {}
+
+		for kind in MAP_KINDS:
+			content:bytes = generateMap(kind, AMOUNT, SEED).encode("UTF-8")
+			file_path:str = os.path.join(self.directory.name, f"{kind}.osu")
+			with open(file_path, mode='wb') as FileObject:
+				FileObject.write(content)
+
+			archive:str = os.path.join(self.directory.name, f"{kind}.osz")
+			with zipfile.ZipFile(archive, mode='w') as Archive:
+				Archive.writestr(MEMBER, content)
+				Archive.writestr("audio.mp3", b"\x00" * 64)
+
+			self.maps[kind] = (content, file_path, archive)
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def sources(self, content:bytes, file_path:str, archive:str) -> list:
+		"""
+			( name, function that returns a new OsuMap ) for every source type
+		"""
+		with open(archive, mode='rb') as FileObject:
+			archive_bytes:bytes = FileObject.read()
+
+		return [
+			("file_path", lambda: OsuMap(file_path=file_path)),
+			("raw_str", lambda: OsuMap(raw_str=content.decode("UTF-8"))),
+			("raw_bytes", lambda: OsuMap(raw_bytes=content)),
+			("memoryview", lambda: OsuMap(raw_bytes=memoryview(content))),
+			("file_object", lambda: OsuMap(file_object=io.BytesIO(content))),
+			("use_mmap", lambda: OsuMap(file_path=file_path, use_mmap=True)),
+			("keep_source", lambda: OsuMap(file_path=file_path, keep_source=False)),
+			("columnar", lambda: OsuMap(file_path=file_path, columnar=True)),
+			("lazy", lambda: OsuMap(file_path=file_path, lazy=True)),
+			("lazy raw_bytes", lambda: OsuMap(raw_bytes=content, lazy=True)),
+			("lazy use_mmap", lambda: OsuMap(file_path=file_path, lazy=True, use_mmap=True)),
+			("sections", lambda: OsuMap(file_path=file_path, sections=("Difficulty", "TimingPoints", "HitObjects"))),
+			("modes", lambda: OsuMap(file_path=file_path, modes=(0,))),
+			("archive", lambda: OsuMap.fromArchive(archive, MEMBER)),
+			("archive lazy", lambda: OsuMap.fromArchive(archive, MEMBER, lazy=True)),
+			("archive object", lambda: next(iterOsz(io.BytesIO(archive_bytes)))),
+			("archive zipfile", lambda: OsuMap.fromArchive(zipfile.ZipFile(archive), MEMBER)),
+		]
+
+	def test_content_hash(self):
+		for kind, (content, file_path, archive) in self.maps.items():
+			expected:str = hashlib.md5(content).hexdigest()
+			for name, create in self.sources(content, file_path, archive):
+				with self.subTest(map=kind, source=name):
+					self.assertEqual(create().contentHash(), expected)
+
+					# before and after calculating
+					Map:OsuMap = create()
+					Map.getPP()
+					self.assertEqual(Map.contentHash(), expected)
+
+	def test_results(self):
+		for kind, (content, file_path, archive) in self.maps.items():
+			expected:list = samplePP(OsuMap(file_path=file_path))
+			for name, create in self.sources(content, file_path, archive):
+				with self.subTest(map=kind, source=name):
+					self.assertEqual(samplePP(create()), expected)
+
+	def test_lazy(self):
+		for kind, (content, file_path, archive) in self.maps.items():
+			with self.subTest(map=kind):
+				Full:OsuMap = OsuMap(file_path=file_path)
+				Lazy:OsuMap = OsuMap(file_path=file_path, lazy=True)
+
+				self.assertEqual(Lazy.title, Full.title)
+				self.assertEqual(Lazy.maxCombo(), Full.maxCombo())
+				self.assertEqual(len(Lazy.timingpoints), len(Full.timingpoints))
+				self.assertEqual(samplePP(Lazy), samplePP(Full))
+
+	def test_lazy_threads(self):
+		for kind, (content, file_path, archive) in self.maps.items():
+			with self.subTest(map=kind):
+				expected:list = samplePP(OsuMap(file_path=file_path))
+				Lazy:OsuMap = OsuMap(file_path=file_path, lazy=True)
+
+				results:list = []
+				barrier:threading.Barrier = threading.Barrier(8)
+				def work() -> None:
+					barrier.wait()
+					results.append( samplePP(Lazy.copy()) )
+
+				threads:list = [ threading.Thread(target=work) for _ in range(8) ]
+				for Thread in threads: Thread.start()
+				for Thread in threads: Thread.join()
+
+				self.assertEqual(results, [expected] * 8)
+
+	def test_binary(self):
+		for kind, (content, file_path, archive) in self.maps.items():
+			for columnar in (False, True):
+				with self.subTest(map=kind, columnar=columnar):
+					Map:OsuMap = OsuMap(file_path=file_path, columnar=columnar)
+					Buffer:io.BytesIO = io.BytesIO()
+					Map.dump(Buffer)
+					Buffer.seek(0)
+					Loaded:OsuMap = OsuMap.load(Buffer, columnar=columnar)
+
+					for name in ("title", "artist_unicode", "version", "tags", "hp", "cs", "od", "ar", "slider_multiplier", "amount_slider"):
+						self.assertEqual(getattr(Loaded, name), getattr(Map, name), name)
+
+					self.assertEqual(len(Loaded.hitobjects), len(Map.hitobjects))
+					self.assertEqual(Loaded.maxCombo(), Map.maxCombo())
+					self.assertEqual(
+						list(hitObjectColumns(Loaded.hitobjects, "curve")[0]),
+						list(hitObjectColumns(Map.hitobjects, "curve")[0])
+					)
+					self.assertEqual(
+						{ index: list(Path.x) for index, Path in Loaded.sliderPaths().items() },
+						{ index: list(Path.x) for index, Path in Map.sliderPaths().items() }
+					)
+					self.assertEqual(samplePP(Loaded), samplePP(Map))
+
+	def test_binary_version(self):
+		Buffer:io.BytesIO = io.BytesIO()
+		OsuMap(raw_str=generateMap(MAP_KINDS[0], 10, SEED)).dump(Buffer)
+		data:bytearray = bytearray(Buffer.getvalue())
+		data[6] += 1 # binary version after the magic
+
+		with self.assertRaises(SyntaxError):
+			OsuMap.load(io.BytesIO(bytes(data)))
+
+if __name__ == "__main__":
+	unittest.main()